@@ -1,14 +1,46 @@
-"""Agents package."""
+"""Agents package.
 
-from agents.base import AgentDecision, BaseAgent
-from agents.design_henk import DesignHenkAgent
-from agents.henk1 import Henk1Agent
-from agents.laserhenk import LaserHenkAgent
+The concrete agents pull in LLM clients, RAG tooling and large model graphs,
+so they are imported lazily (PEP 562) on first attribute access. A process
+that only uses one agent only pays for that agent's imports.
+"""
 
-__all__ = [
+import importlib
+from typing import Any
+
+from agents.base import AgentDecision, AgentProtocol, BaseAgent
+
+__all__ = (
     "BaseAgent",
     "AgentDecision",
+    "AgentProtocol",
     "Henk1Agent",
     "DesignHenkAgent",
     "LaserHenkAgent",
-]
+    "OperatorAgent",
+)
+
+
+# Lazy import mapping
+_LAZY_IMPORTS = {
+    "DesignHenkAgent": ("agents.design_henk", "DesignHenkAgent"),
+    "Henk1Agent": ("agents.henk1", "Henk1Agent"),
+    "LaserHenkAgent": ("agents.laserhenk", "LaserHenkAgent"),
+    "OperatorAgent": ("agents.operator", "OperatorAgent"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import agent classes on first access and cache them on the package."""
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module 'agents' has no attribute '{name}'")
+    module_name, attr_name = _LAZY_IMPORTS[name]
+    obj = getattr(importlib.import_module(module_name), attr_name)
+    globals()[name] = obj
+    return obj
+
+
+def __dir__() -> list[str]:
+    """Return list of available attributes for autocomplete."""
+    return sorted(set(globals()) | set(__all__))
+
@@ -1,33 +1,142 @@
 """Base Agent Classes."""
 
-from abc import ABC, abstractmethod
-from typing import Optional
-
-from pydantic import BaseModel, Field
+import asyncio
+import functools
+import inspect
+import json
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Mapping, Optional, Protocol
 
 from models.customer import SessionState
 
+try:  # Optional dependency: C-level JSON encoder for logging/telemetry paths
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+# Computed once; SessionState validation silently ignores unknown keys.
+_SESSION_FIELDS = frozenset(SessionState.model_fields)
+
+
+@dataclass(slots=True, frozen=True)
+class AgentDecision:
+    """
+    Agent decision output.
+
+    Decisions are built internally from trusted values on every agent turn,
+    so this is a plain slotted dataclass rather than a validated model.
+
+    Attributes:
+        next_agent: Next agent to route to
+        message: Message to user or next agent
+        action: Action to perform (e.g., 'query_rag', 'create_lead')
+        action_params: Parameters for the action (read-only view)
+        should_continue: Whether to continue conversation
+    """
+
+    next_agent: Optional[str] = None
+    message: Optional[str] = None
+    action: Optional[str] = None
+    action_params: Optional[Mapping[str, Any]] = None
+    should_continue: bool = True
+
+    def __post_init__(self) -> None:
+        # Wrap instead of copying: callers hand over dict literals they never
+        # touch again, and the proxy keeps the frozen decision read-only.
+        if isinstance(self.action_params, dict):
+            object.__setattr__(self, "action_params", MappingProxyType(self.action_params))
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the decision as a plain dict for API boundaries."""
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
+        if data["action_params"] is not None:
+            data["action_params"] = dict(data["action_params"])
+        return data
+
+    def to_bytes(self) -> bytes:
+        """Serialize the decision to compact JSON bytes for logs and traces."""
+        if orjson is not None:
+            # orjson encodes slotted dataclasses natively; the read-only
+            # action_params proxy is the only value it needs help with.
+            return orjson.dumps(self, default=dict)
+        return json.dumps(
+            self.to_dict(), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+    @classmethod
+    def model_validate(cls, data: Any) -> "AgentDecision":
+        """Compatibility shim for callers that used the former Pydantic model."""
+        if isinstance(data, cls):
+            return data
+        known = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in dict(data).items() if key in known})
 
-class AgentDecision(BaseModel):
-    """Agent decision output."""
 
-    next_agent: Optional[str] = Field(None, description="Next agent to route to")
-    message: Optional[str] = Field(None, description="Message to user or next agent")
-    action: Optional[str] = Field(
-        None, description="Action to perform (e.g., 'query_rag', 'create_lead')"
-    )
-    action_params: Optional[dict] = Field(None, description="Parameters for the action")
-    should_continue: bool = Field(True, description="Whether to continue conversation")
+class AgentProtocol(Protocol):
+    """Structural type for anything that can act as an agent."""
 
+    agent_name: str
 
-class BaseAgent(ABC):
-    """Base class for all agents."""
+    async def process(self, state: SessionState) -> AgentDecision: ...
+
+
+class BaseAgent:
+    """
+    Base class for all agents.
+
+    Not an ABC: subclasses must override ``process``, which type checkers
+    enforce via ``AgentProtocol`` without ABCMeta work on every instantiation.
+    Slotted: subclasses that only hold fixed attributes should declare their
+    own ``__slots__`` to stay free of a per-instance ``__dict__``.
+    """
+
+    __slots__ = ("agent_name", "_update_state")
+
+    # Upper bound for concurrent LLM calls, shared by all instances of an
+    # agent class (see configure_concurrency).
+    max_concurrency: int = 8
+    _llm_semaphore: Optional[asyncio.Semaphore] = None
 
     def __init__(self, agent_name: str):
         """Initialize agent."""
         self.agent_name = agent_name
+        # Bound once so each turn's state update skips the agent_name lookup.
+        self._update_state = functools.partial(
+            BaseAgent._update_state_impl, agent_name=agent_name
+        )
+
+    @classmethod
+    def configure_concurrency(cls, limit: int) -> None:
+        """Set the maximum number of concurrent LLM calls for this agent class."""
+        if limit < 1:
+            raise ValueError("limit must be >= 1")
+        cls.max_concurrency = limit
+        cls._llm_semaphore = asyncio.Semaphore(limit)
+
+    @classmethod
+    def _get_llm_semaphore(cls) -> asyncio.Semaphore:
+        semaphore = cls.__dict__.get("_llm_semaphore")
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(cls.max_concurrency)
+            cls._llm_semaphore = semaphore
+        return semaphore
+
+    async def _call_llm(self, coro):
+        """Await an LLM coroutine while holding this agent class's concurrency slot."""
+        semaphore = self._get_llm_semaphore()
+        try:
+            await semaphore.acquire()
+        except BaseException:
+            coro.close()
+            raise
+        try:
+            return await coro
+        finally:
+            semaphore.release()
 
-    @abstractmethod
     async def process(self, state: SessionState) -> AgentDecision:
         """
         Process the current state and return decision.
@@ -38,11 +147,103 @@ class BaseAgent(ABC):
         Returns:
             AgentDecision with routing and action information
         """
-        pass
-
-    def _update_state(self, state: SessionState, **updates) -> SessionState:
-        """Helper to update state."""
-        updated_data = state.model_dump()
-        updated_data.update(updates)
-        updated_data["current_agent"] = self.agent_name
-        return SessionState(**updated_data)
+        raise NotImplementedError(f"{type(self).__name__} must implement process()")
+
+    @staticmethod
+    def _update_state_impl(
+        state: SessionState, agent_name: str, **updates
+    ) -> SessionState:
+        """
+        Helper to update state; call it as ``self._update_state(state, **updates)``.
+
+        Validates the merged fields instead of a ``model_dump`` round-trip:
+        update values are validated and coerced as before, while untouched
+        nested models are reused as-is (shared with ``state``, not copied).
+        If nothing would change (no updates and this agent is already
+        current), ``state`` itself is returned.
+
+        Raises:
+            ValueError: If an update key is not a SessionState field
+            pydantic.ValidationError: If an update value is invalid
+        """
+        if not updates and state.current_agent == agent_name:
+            return state
+        for key in updates:
+            if key not in _SESSION_FIELDS:
+                raise ValueError(f"Unknown SessionState field: {key}")
+        return SessionState.model_validate(
+            {**dict(state), **updates, "current_agent": agent_name}
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def _signature_params(func: Callable) -> frozenset[str]:
+    return frozenset(inspect.signature(func).parameters)
+
+
+def pydantic_run_params(pydantic_agent: Any) -> frozenset[str]:
+    """
+    Parameter names accepted by ``pydantic_agent.run``.
+
+    Pydantic-AI renamed ``run`` arguments across versions, so callers filter
+    their kwargs by this set. The signature is inspected once per ``run``
+    implementation, not on every call.
+    """
+    run = pydantic_agent.run
+    return _signature_params(getattr(run, "__func__", run))
+
+
+def keyword_re(keywords: Iterable[str]) -> re.Pattern:
+    """
+    Compile a keyword table into one alternation: one scan per message.
+
+    Keywords match as plain substrings. The lookahead keeps ``findall``
+    reporting overlapping hits, e.g. both keywords in "meetingala".
+    """
+    return re.compile("(?=(%s))" % "|".join(map(re.escape, keywords)))
+
+
+def normalize_phrase(text: str) -> str:
+    """
+    Cache-key form of a short user phrase: casefolded, whitespace collapsed.
+
+    Punctuation is kept: "Spitzrevers?" and "Spitzrevers!" can mean different things.
+    """
+    return " ".join(text.casefold().split())
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry."""
+
+    __slots__ = ("maxsize", "_data")
+
+    def __init__(self, maxsize: int):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Return the value for ``key`` and mark it as recently used."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: Any, value: Any) -> None:
+        """Store ``value``; evicts the least recently used entry when full."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def values(self):
+        return self._data.values()
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -52,26 +52,356 @@ BEISPIEL-ABLAUF:
 8. Weiter zu LASERHENK für Finalisierung
 """
 
+import asyncio
+import functools
 import json
 import logging
 import os
+import re
+from pathlib import Path
 from typing import Optional
 
-from agents.base import AgentDecision, BaseAgent
+from agents.base import AgentDecision, BaseAgent, LRUCache, keyword_re, normalize_phrase
 from agents.prompt_loader import IMAGE_SYSTEM_CONTRACT
 from agents.design_patch_agent import DesignPatchAgent
+from agents.openai_client import get_openai_client
 from models.customer import SessionState
 from models.fabric import SelectedFabricData
 from models.patches import apply_design_preferences_patch
 
-try:
-    from openai import AsyncOpenAI
-except ModuleNotFoundError:
-    AsyncOpenAI = None
+try:  # Optional dependency: faster JSON parsing, stdlib json as fallback
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - environment without orjson
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+def _json_loads(data: "bytes | str"):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+_STYLE_CATALOG_PATH = (
+    Path(__file__).resolve().parent.parent / "drive_mirror" / "henk" / "knowledge" / "style_catalog.json"
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_style_catalog() -> dict:
+    """
+    Load style catalog from knowledge base.
+
+    Cached for the process lifetime: all agent instances share the parsed
+    catalog, so callers must treat it as read-only.
+
+    Returns:
+        Style catalog dict or empty dict if failed
+    """
+    try:
+        catalog = _json_loads(_STYLE_CATALOG_PATH.read_bytes())
+    except FileNotFoundError:
+        logger.warning("[DesignHenk] Style catalog not found at %s", _STYLE_CATALOG_PATH)
+        return {}
+    except Exception as exc:
+        logger.warning("[DesignHenk] Failed to load style catalog: %s", exc)
+        return {}
+
+    logger.info(
+        "[DesignHenk] ✅ Style catalog loaded: %d dress codes",
+        len(catalog.get("dress_codes", {})),
+    )
+    return catalog
+
+
+@functools.lru_cache(maxsize=64)
+def _revers_keyword(revers_type: str) -> str:
+    """Map a revers type to its style keyword: pointed lapels read classic."""
+    return "klassisch" if "spitz" in revers_type.lower() else "modern"
+
+
+# Occasion keyword (substring of the lowercased occasion) → catalog dress code,
+# checked in order
+_OCCASION_DRESS_CODES = {
+    "hochzeit": "formal_evening",
+    "gala": "formal_evening",
+    "business": "business_formal",
+    "vorstellungsgespräch": "business_formal",
+    "arbeit": "business_casual",
+    "meeting": "business_casual",
+    "freizeit": "smart_casual",
+    "restaurant": "smart_casual",
+}
+_OCCASION_RE = keyword_re(_OCCASION_DRESS_CODES)
+
+# (catalog, rendered blocks per dress code, overview) for the last catalog
+# seen; the overview is only rendered once an occasion falls back to it
+_dress_code_text: tuple[Optional[dict], dict[str, str], Optional[str]] = (None, {}, None)
+
+
+def _dress_code_blocks(catalog: dict) -> dict[str, str]:
+    """
+    Render the recommendation block for every dress code in ``catalog``.
+
+    Rendered once per catalog object, i.e. once per process for the shared
+    catalog.
+    """
+    global _dress_code_text
+    cached_catalog, blocks, _ = _dress_code_text
+    if cached_catalog is catalog:
+        return blocks
+
+    blocks = {
+        code_key: (
+            f"- Stil: {dc['name']}\n"
+            f"- Erforderlich: {', '.join(dc.get('required_items', []))}\n"
+            f"- Farben: {', '.join(dc.get('color_palette', []))}\n"
+            f"- Stoffe: {', '.join(dc.get('fabric_recommendations', []))}\n"
+        )
+        for code_key, dc in catalog.get("dress_codes", {}).items()
+    }
+    _dress_code_text = (catalog, blocks, None)
+    return blocks
+
+
+def _dress_code_overview(catalog: dict) -> str:
+    """Render the general dress code overview for ``catalog`` on first use."""
+    global _dress_code_text
+    blocks = _dress_code_blocks(catalog)
+    overview = _dress_code_text[2]
+    if overview is not None:
+        return overview
+
+    parts = ["\n📚 VERFÜGBARE DRESS CODES:\n"]
+    for code_data in catalog.get("dress_codes", {}).values():
+        occasions = code_data.get('occasions', [])
+        colors = code_data.get('color_palette', [])
+        parts.append(f"\n{code_data['name']}:\n")
+        parts.append(f"  - Anlässe: {', '.join(occasions[:3])}\n")
+        parts.append(f"  - Farben: {', '.join(colors[:3])}\n")
+    overview = "".join(parts)
+
+    _dress_code_text = (catalog, blocks, overview)
+    return overview
+
+
+# DesignPatchAgent holds no per-session state, so one instance serves all
+# sessions; building it sets up a Pydantic-AI agent with its system prompt.
+_patch_agent: Optional[DesignPatchAgent] = None
+
+
+def _get_patch_agent() -> DesignPatchAgent:
+    """Return the shared DesignPatchAgent, creating it on first use."""
+    global _patch_agent
+    if _patch_agent is None:
+        _patch_agent = DesignPatchAgent(openai_client=get_openai_client())
+    return _patch_agent
+
+
+_LLM_FALLBACK_MESSAGE = "Lass uns über die Design-Details deines Anzugs sprechen!"
+
+# Fixed Design HENK messages and per-turn LLM instructions. The few that vary
+# only by mood-board iteration are rendered once per iteration count.
+_MAX_MOOD_BOARD_ITERATIONS = 7
+_PREFERENCES_CONTEXT = (
+    "Der Kunde hat einen Stoff ausgewählt. Frage jetzt nach Design-Präferenzen "
+    "(Revers, Schultern, Hosenbund)."
+)
+_MAX_ITERATIONS_MESSAGE = (
+    "Ich verstehe, dass das Moodbild noch nicht perfekt ist. "
+    "Wir haben das Maximum an Iterationen erreicht, aber keine Sorge - "
+    "beim persönlichen Termin können wir alle Details noch genau besprechen!\n\n"
+    "Lass uns jetzt mit der Terminvereinbarung fortfahren."
+)
+_GENERATING_MESSAGES = tuple(
+    "Generiere Ihr Outfit-Moodbild "
+    + (f"(Iteration {count}/{_MAX_MOOD_BOARD_ITERATIONS})" if count > 1 else "")
+    + "..."
+    for count in range(_MAX_MOOD_BOARD_ITERATIONS + 1)
+)
+_PRESENTATION_CONTEXTS = tuple(
+    "Das Moodbild wurde generiert. Präsentiere es dem Kunden charmant und frage, "
+    f"ob es ihm gefällt. Erwähne, dass noch {iterations_left} Änderungen möglich sind."
+    for iterations_left in range(_MAX_MOOD_BOARD_ITERATIONS + 1)
+)
+_CLARIFY_FEEDBACK_MESSAGE = (
+    "Könntest du bitte noch etwas genauer sagen, was am Moodbild anders sein soll? "
+    "Zum Beispiel Revers, Schultern, Hose oder Weste."
+)
+# Feedback that explicitly asks for a new image even if nothing else changes
+_REGENERATE_RE = keyword_re([
+    "neues bild", "neues moodbild", "anderes bild", "neu generieren", "neu erstellen",
+    "nochmal generieren", "noch mal generieren", "neue variante", "andere variante",
+])
+_EMAIL_REQUEST_CONTEXT = (
+    "Das Moodbild wurde genehmigt! Gratuliere dem Kunden und frage charmant nach "
+    "seiner E-Mail-Adresse, um den Termin vorzubereiten."
+)
+_DESIGN_COMPLETE_CONTEXT = (
+    "Design-Phase erfolgreich abgeschlossen! Gratuliere dem Kunden und frage, ob er "
+    "den Termin lieber zu Hause oder im Büro haben möchte."
+)
+
+# SelectedFabricData fields copied 1:1 from a fabric dict (image_url is resolved separately)
+_FABRIC_FIELDS = ("fabric_code", "color", "pattern", "composition", "texture", "supplier")
+
+
+def _fabric_image_url(fabric: dict) -> Optional[str]:
+    """First fabric image available: ``image_url``, ``url``, then the first local path.
+
+    Shown/favorite fabrics only carry ``url``; RAG fabrics may use any of the three.
+    """
+    local_paths = fabric.get("local_image_paths")
+    return fabric.get("image_url") or fabric.get("url") or (local_paths[0] if local_paths else None)
+
+
+# DesignPreferences fields handed to the DALLE tool
+DESIGN_PREF_FIELDS = (
+    "revers_type",
+    "shoulder_padding",
+    "waistband_type",
+    "jacket_front",
+    "lapel_style",
+    "lapel_roll",
+    "trouser_front",
+    "notes_normalized",
+    "wants_vest",
+    "trouser_color",
+    "preferred_material",
+    "requested_fabric_code",
+)
+
+# Process-wide LRU of normalized feedback → style keywords. Feedback phrases
+# recur across sessions ("modern, italienisch"); case and spacing do not matter.
+_feedback_keyword_cache = LRUCache(512)
+_WORD_RE = re.compile(r"\w+")
+
+
+# Structured output for _extract_style_keywords_from_feedback: the strict
+# schema constrains the answer, so the prompt needs no few-shot examples.
+_FEEDBACK_KEYWORDS_PROMPT = (
+    "Extract short English style keywords from German feedback on a bespoke suit. "
+    "Cover style, construction, regional influence, occasion and design details."
+)
+# Static instructions shared by all sessions: one prompt cache bucket
+_FEEDBACK_KEYWORDS_CACHE_PARAMS = {"prompt_cache_key": "design_henk:feedback_keywords"}
+_FEEDBACK_KEYWORDS_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "keywords",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "keywords": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "maxItems": 8,
+                }
+            },
+            "required": ["keywords"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+# Minimum number of history messages sent with each Design HENK LLM turn
+_HISTORY_WINDOW = 10
+
+# Reply cache for canned Design HENK turns (opt-in via DESIGN_HENK_REPLY_CACHE).
+# Keyed on the per-turn context (fabric, preferences, iteration, instruction)
+# plus the normalized latest user message; earlier history is not part of the
+# key, which is why the cache is off by default.
+_reply_cache = LRUCache(256)
+
+
+def _reply_cache_enabled() -> bool:
+    return os.getenv("DESIGN_HENK_REPLY_CACHE", "false").lower() == "true"
+
+
+def _reply_cache_key(messages: list[dict]) -> tuple:
+    last = messages[-1]
+    user_input = last["content"] if last["role"] == "user" else ""
+    context = tuple(m["content"] for m in messages[1:] if m["role"] == "system")
+    return context, normalize_phrase(user_input)
+
+
+# Approval/rejection turns carry no style information; skip the LLM for them
+_TRIVIAL_FEEDBACK = frozenset(
+    {
+        ("ja",),
+        ("nein",),
+        ("passt",),
+        ("gefällt",),
+        ("gefällt", "mir"),
+        ("super",),
+        ("ok",),
+        ("okay",),
+        ("perfekt",),
+        ("weiter",),
+    }
+)
+
+
+def _is_trivial_feedback(feedback: str) -> bool:
+    words = tuple(_WORD_RE.findall(feedback.casefold()))
+    # No words: pure punctuation/emoji such as "👍" or "?!"
+    return not words or words in _TRIVIAL_FEEDBACK or len(" ".join(words)) < 4
+
+
+# Static Design HENK system prompt, rendered once at import (see _get_system_prompt)
+DESIGN_HENK_SYSTEM_PROMPT = f"""Du bist Design HENK, der kreative Design-Spezialist bei LASERHENK.
+
+Deine Aufgabe - DESIGN-BERATUNG & VISUALISIERUNG:
+
+🎨 DEINE ROLLE:
+- Du bist charmant, kreativ und detailversessen
+- Du hilfst dem Kunden, seinen perfekten Anzug zu visualisieren
+- Du stellst Fragen zu Schnitt-Details (Revers, Schultern, Hose, etc.)
+- Du erstellst Moodbilder basierend auf seinen Wünschen
+- Du iterierst bis der Kunde zufrieden ist (max. 7 Iterationen)
+
+💬 GESPRÄCHSFÜHRUNG:
+- Sei herzlich, persönlich und begeisternd
+- Nutze lockere Sprache ("du", emoji 🎩✨)
+- Erkläre Design-Optionen verständlich
+- Reagiere auf ALLE Kundenfragen (Preis, Lieferzeit, Details, etc.)
+- Gehe auf Feedback ein und passe das Moodbild an
+
+🎯 DESIGN-DETAILS ZU KLÄREN:
+1. Revers-Stil (Spitzrevers, Stegrevers, Schalkragen)
+2. Schulterpolsterung (keine, leicht, mittel, stark)
+3. Hosenbund (Bundfalte, glatt)
+4. Weste (ja/nein)
+5. Weitere Präferenzen (Knopfanzahl, Taschenstil)
+
+📸 MOODBILD-ITERATION:
+- Nach jedem Feedback: Erkläre kurz, was du änderst
+- Sei positiv und motivierend
+- Zeige Verständnis für Kundenwünsche
+- Wenn zufrieden → Lead sichern & Termin vereinbaren
+
+💰 PREISE (wenn gefragt):
+- Einstieg: ab 899€ (2-Teiler, Standardstoffe)
+- Premium: 1.200-2.500€ (hochwertige Stoffe, mehr Details)
+- Luxus: 2.500€+ (exklusive Stoffe, alle Details)
+- Hinweis: "Genauer Preis wird im persönlichen Termin besprochen"
+
+⏱️ LIEFERZEIT (wenn gefragt):
+- Standardproduktion: 4-6 Wochen
+- Express: 2-3 Wochen (gegen Aufpreis)
+- Bei Termindruck: "Wir finden eine Lösung!"
+
+Wichtig: Antworte IMMER auf Deutsch, kurz, charmant und hilfreich!
+
+{IMAGE_SYSTEM_CONTRACT}"""
+
+# Per-turn context appended after the static prompt (see _get_context_prompt)
+DESIGN_HENK_CONTEXT_TEMPLATE = (
+    "📊 AKTUELLER STATUS:{fabric_info}{design_info}{iteration_info}\n{style_knowledge}"
+)
+
+
 class DesignHenkAgent(BaseAgent):
     """
     Design HENK (HENK2) - Design & Leadsicherung Agent.
@@ -94,22 +424,17 @@ class DesignHenkAgent(BaseAgent):
         """Initialize Design HENK Agent."""
         super().__init__("design_henk")
 
-        # Initialize OpenAI client for LLM conversations
+        # Shared OpenAI client for LLM conversations
         self.client = None
-        if AsyncOpenAI is not None and os.environ.get("OPENAI_API_KEY"):
-            try:
-                self.client = AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+        try:
+            self.client = get_openai_client()
+            if self.client:
                 logger.info("[DesignHenk] ✅ OpenAI client initialized")
-            except Exception as exc:
-                logger.warning("[DesignHenk] OpenAI client initialization failed: %s", exc)
+        except Exception as exc:
+            logger.warning("[DesignHenk] OpenAI client initialization failed: %s", exc)
 
-        # Load style catalog for RAG knowledge
-        self.style_catalog = self._load_style_catalog()
-        if self.style_catalog:
-            dress_codes = list(self.style_catalog.get("dress_codes", {}).keys())
-            logger.info("[DesignHenk] ✅ Style catalog loaded: %d dress codes", len(dress_codes))
-        else:
-            logger.warning("[DesignHenk] ⚠️ Style catalog not loaded")
+        # Style catalog for RAG knowledge (parsed once per process, read-only)
+        self.style_catalog = _load_style_catalog()
 
     async def process(self, state: SessionState) -> AgentDecision:
         """
@@ -126,28 +451,26 @@ class DesignHenkAgent(BaseAgent):
         Returns:
             AgentDecision with next steps
         """
+        prefs = state.design_preferences
+        image_state = state.image_state
+
         # TEMPORARY: Mark as queried to skip infinite loop
         if not state.design_rag_queried:
             state.design_rag_queried = True
             logger.info("[DesignHenk] ⚠️ Design RAG disabled - skipping to preferences collection")
 
         # Check if design preferences are collected
-        preferences_complete = (
-            state.design_preferences.revers_type is not None
-            and state.design_preferences.shoulder_padding is not None
-        )
-
-        if not preferences_complete:
+        if not prefs.preferences_complete:
             # Use LLM for flexible conversation about design preferences
             llm_response = await self._process_with_llm(
                 state,
-                context_message="Der Kunde hat einen Stoff ausgewählt. Frage jetzt nach Design-Präferenzen (Revers, Schultern, Hosenbund)."
+                context_message=_PREFERENCES_CONTEXT,
             )
 
             # Set default values to prevent infinite loop (will be overridden by user feedback)
-            state.design_preferences.revers_type = "Spitzrevers"
-            state.design_preferences.shoulder_padding = "mittel"
-            state.design_preferences.waistband_type = "bundfalte"
+            prefs.revers_type = "Spitzrevers"
+            prefs.shoulder_padding = "mittel"
+            prefs.waistband_type = "bundfalte"
 
             return AgentDecision(
                 next_agent=None,
@@ -156,93 +479,87 @@ class DesignHenkAgent(BaseAgent):
                 should_continue=False,
             )
 
-        # Check if we have a CRM lead (real Pipedrive OR MOCK for development)
-        # CRITICAL: MOCK leads ARE acceptable to prevent infinite loop
-        # Only exclude provisional HENK1 leads (created before mood board approval)
-        has_crm_lead = (
-            state.customer.crm_lead_id
-            and not state.customer.crm_lead_id.startswith("HENK1_LEAD")  # Only exclude provisional HENK1 leads
-        )
+        # Real Pipedrive OR MOCK lead (CRITICAL: MOCK prevents an infinite loop);
+        # provisional HENK1 leads do not count
+        has_crm_lead = state.customer.has_crm_lead
 
         # MOOD BOARD ITERATION LOOP (Max 7 iterations)
         # Check if mood board needs to be generated or re-generated
-        if not state.image_state.mood_board_approved:
+        if not image_state.mood_board_approved:
             # Check if we've hit the iteration limit
-            if state.image_state.mood_board_iteration_count >= 7:
+            if image_state.mood_board_iteration_count >= _MAX_MOOD_BOARD_ITERATIONS:
                 logger.warning("[DesignHenk] Max iterations (7) reached for mood board")
                 # Force approval and continue
-                state.image_state.mood_board_approved = True
+                image_state.mood_board_approved = True
                 return AgentDecision(
                     next_agent=None,
-                    message="Ich verstehe, dass das Moodbild noch nicht perfekt ist. "
-                           "Wir haben das Maximum an Iterationen erreicht, aber keine Sorge - "
-                           "beim persönlichen Termin können wir alle Details noch genau besprechen!\n\n"
-                           "Lass uns jetzt mit der Terminvereinbarung fortfahren.",
+                    message=_MAX_ITERATIONS_MESSAGE,
                     action=None,
                     should_continue=False,
                 )
 
             # Generate or re-generate mood board
-            if not state.mood_image_url or state.image_state.mood_board_feedback:
-                logger.info(f"[DesignHenk] Generating mood board (iteration {state.image_state.mood_board_iteration_count + 1}/7)")
-
-                # Increment iteration counter
-                state.image_state.mood_board_iteration_count += 1
-
-                # Prepare fabric data from HENK1 payload or RAG context
-                fabric_data = self._extract_fabric_data(state)
-
-                # Prepare design preferences
-                design_prefs = {
-                    "revers_type": state.design_preferences.revers_type,
-                    "shoulder_padding": state.design_preferences.shoulder_padding,
-                    "waistband_type": state.design_preferences.waistband_type,
-                    "wants_vest": state.design_preferences.wants_vest,
-                    "trouser_color": state.design_preferences.trouser_color,
-                    "preferred_material": state.design_preferences.preferred_material,
-                    "requested_fabric_code": state.design_preferences.requested_fabric_code,
-                }
-
+            if not state.mood_image_url or image_state.mood_board_feedback:
                 # Extract style keywords
                 style_keywords = self._extract_style_keywords(state)
+                regenerate = False
 
                 # Include user feedback in prompt if available
-                if state.image_state.mood_board_feedback:
-                    logger.info(f"[DesignHenk] Incorporating user feedback: {state.image_state.mood_board_feedback}")
-
-                    # Extract structured patches from feedback
-                    patch_agent = DesignPatchAgent()
-                    decision = await patch_agent.extract_patch_decision(
-                        user_message=state.image_state.mood_board_feedback,
-                        context="Designpräferenzen Update",
+                if image_state.mood_board_feedback:
+                    regenerate = (
+                        _REGENERATE_RE.search(image_state.mood_board_feedback.lower()) is not None
                     )
-
                     logger.info(
-                        "[DesignHenk] PatchDecision for feedback '%s': %s",
-                        state.image_state.mood_board_feedback,
-                        decision.model_dump_json(),
+                        "[DesignHenk] Incorporating user feedback: %s",
+                        image_state.mood_board_feedback,
+                    )
+
+                    # Extract structured patches and style keywords from the
+                    # feedback concurrently: both are independent LLM calls.
+                    patch_agent = _get_patch_agent()
+                    decision, feedback_keywords = await asyncio.gather(
+                        patch_agent.extract_patch_decision(
+                            user_message=image_state.mood_board_feedback,
+                            context="Designpräferenzen Update",
+                        ),
+                        self._extract_style_keywords_from_feedback(
+                            image_state.mood_board_feedback
+                        ),
                     )
 
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(
+                            "[DesignHenk] PatchDecision for feedback '%s': %s",
+                            image_state.mood_board_feedback,
+                            decision.model_dump_json(),
+                        )
+
                     # Apply patches to design preferences
+                    applied_fields: list[str] = []
                     if decision.confidence > 0.5:
-                        applied_fields = []
                         updated_preferences = apply_design_preferences_patch(
-                            state.design_preferences, decision.patch
+                            prefs, decision.patch
                         )
 
-                        for field_name in updated_preferences.model_fields:
-                            new_value = getattr(updated_preferences, field_name)
-                            old_value = getattr(state.design_preferences, field_name)
-                            if new_value != old_value:
-                                applied_fields.append(field_name)
-                                logger.info(
-                                    "[DesignHenk] 🔄 Updated %s: %s → %s",
-                                    field_name,
-                                    old_value,
-                                    new_value,
-                                )
+                        # Only explicitly set fields can differ from the old preferences
+                        old_preferences = prefs
+                        applied_fields = [
+                            field_name
+                            for field_name in sorted(updated_preferences.model_fields_set)
+                            if getattr(updated_preferences, field_name)
+                            != getattr(old_preferences, field_name)
+                        ]
+                        if applied_fields and logger.isEnabledFor(logging.INFO):
+                            logger.info(
+                                "[DesignHenk] 🔄 Updated %s",
+                                ", ".join(
+                                    f"{field_name}: {getattr(old_preferences, field_name)} → "
+                                    f"{getattr(updated_preferences, field_name)}"
+                                    for field_name in applied_fields
+                                ),
+                            )
 
-                        state.design_preferences = updated_preferences
+                        prefs = state.design_preferences = updated_preferences
 
                         # Update wants_vest in root state
                         if decision.patch.wants_vest is not None:
@@ -261,24 +578,19 @@ class DesignHenkAgent(BaseAgent):
                                 requested_code,
                             )
 
-                            # Search for fabric in shown_fabric_images
-                            fabric_found = False
-                            if state.shown_fabric_images:
-                                for fabric in state.shown_fabric_images:
-                                    if fabric.get("fabric_code") == requested_code:
-                                        # Update favorite_fabric to new selection
-                                        old_fabric = state.favorite_fabric.get("fabric_code") if state.favorite_fabric else None
-                                        state.favorite_fabric = fabric
-                                        fabric_found = True
-                                        applied_fields.append("requested_fabric_code")
-                                        logger.info(
-                                            "[DesignHenk] ✅ Switched fabric: %s → %s",
-                                            old_fabric,
-                                            requested_code,
-                                        )
-                                        break
-
-                            if not fabric_found:
+                            # Look up fabric in shown_fabric_images
+                            fabric = state.fabric_state.find_shown_fabric(requested_code)
+                            if fabric is not None:
+                                # Update favorite_fabric to new selection
+                                old_fabric = state.favorite_fabric.get("fabric_code") if state.favorite_fabric else None
+                                state.favorite_fabric = fabric
+                                applied_fields.append("requested_fabric_code")
+                                logger.info(
+                                    "[DesignHenk] ✅ Switched fabric: %s → %s",
+                                    old_fabric,
+                                    requested_code,
+                                )
+                            else:
                                 logger.warning(
                                     "[DesignHenk] ⚠️ Requested fabric %s not found in shown_fabric_images",
                                     requested_code,
@@ -289,35 +601,12 @@ class DesignHenkAgent(BaseAgent):
                             len(applied_fields),
                             applied_fields,
                         )
-
-                        # Update design_prefs dict for DALLE
-                        design_prefs.update(
-                            {
-                                "revers_type": state.design_preferences.revers_type,
-                                "shoulder_padding": state.design_preferences.shoulder_padding,
-                                "waistband_type": state.design_preferences.waistband_type,
-                                "jacket_front": state.design_preferences.jacket_front,
-                                "lapel_style": state.design_preferences.lapel_style,
-                                "lapel_roll": state.design_preferences.lapel_roll,
-                                "trouser_front": state.design_preferences.trouser_front,
-                                "notes_normalized": state.design_preferences.notes_normalized,
-                                "wants_vest": state.design_preferences.wants_vest,
-                                "trouser_color": state.design_preferences.trouser_color,
-                                "preferred_material": state.design_preferences.preferred_material,
-                                "requested_fabric_code": state.design_preferences.requested_fabric_code,
-                            }
-                        )
                     else:
                         logger.warning(
                             "[DesignHenk] ⚠️ Low confidence (%.2f), not applying patches",
                             decision.confidence,
                         )
 
-                    # Extract style keywords from feedback using LLM
-                    feedback_keywords = await self._extract_style_keywords_from_feedback(
-                        state.image_state.mood_board_feedback
-                    )
-
                     # Merge with existing style keywords
                     if feedback_keywords:
                         style_keywords.extend(feedback_keywords)
@@ -327,32 +616,69 @@ class DesignHenkAgent(BaseAgent):
                         )
 
                     # Clear feedback after incorporating
-                    state.image_state.mood_board_feedback = None
+                    image_state.mood_board_feedback = None
+
+                    # Nothing changed: the render would be identical, so ask
+                    # instead of spending one of the iterations on it
+                    if (
+                        state.mood_image_url
+                        and not applied_fields
+                        and not feedback_keywords
+                        and not regenerate
+                    ):
+                        logger.info("[DesignHenk] Feedback changed nothing, asking for clarification")
+                        return AgentDecision(
+                            next_agent=None,
+                            message=(
+                                decision.clarification_questions[0]
+                                if decision.clarification_questions
+                                else _CLARIFY_FEEDBACK_MESSAGE
+                            ),
+                            action=None,
+                            should_continue=False,
+                        )
+
+                image_state.mood_board_iteration_count += 1
+                logger.info(
+                    "[DesignHenk] Generating mood board (iteration %d/%d)",
+                    image_state.mood_board_iteration_count,
+                    _MAX_MOOD_BOARD_ITERATIONS,
+                )
 
-                iteration_msg = f"(Iteration {state.image_state.mood_board_iteration_count}/7)" if state.image_state.mood_board_iteration_count > 1 else ""
+                # Prepare fabric data after the patch so a requested fabric switch applies
+                fabric_params = self._fabric_data_params(state)
+
+                # Design preferences for DALLE, built once after any patch
+                design_prefs = {
+                    field: getattr(prefs, field)
+                    for field in DESIGN_PREF_FIELDS
+                }
 
                 return AgentDecision(
                     next_agent=None,
-                    message=f"Generiere Ihr Outfit-Moodbild {iteration_msg}...",
+                    message=_GENERATING_MESSAGES[image_state.mood_board_iteration_count],
                     action="dalle_tool",
                     action_params={
                         "prompt_type": "outfit_visualization",
-                        "fabric_data": fabric_data.model_dump(exclude_none=True),
+                        "fabric_data": fabric_params,
                         "design_preferences": design_prefs,
                         "style_keywords": style_keywords,
                         "session_id": state.session_id,
+                        "regenerate": regenerate,
                     },
                     should_continue=True,
                 )
 
             # Mood board generated, waiting for user approval
-            if state.mood_image_url and not state.image_state.mood_board_approved:
-                iterations_left = 7 - state.image_state.mood_board_iteration_count
+            if state.mood_image_url and not image_state.mood_board_approved:
+                iterations_left = max(
+                    _MAX_MOOD_BOARD_ITERATIONS - image_state.mood_board_iteration_count, 0
+                )
 
                 # Use LLM for flexible, charming mood board presentation
                 llm_response = await self._process_with_llm(
                     state,
-                    context_message=f"Das Moodbild wurde generiert. Präsentiere es dem Kunden charmant und frage, ob es ihm gefällt. Erwähne, dass noch {iterations_left} Änderungen möglich sind."
+                    context_message=_PRESENTATION_CONTEXTS[iterations_left],
                 )
 
                 return AgentDecision(
@@ -363,12 +689,12 @@ class DesignHenkAgent(BaseAgent):
                 )
 
         # MOOD BOARD APPROVED - Check email before CRM lead creation
-        if state.image_state.mood_board_approved and not has_crm_lead:
+        if image_state.mood_board_approved and not has_crm_lead:
             logger.info("[DesignHenk] Mood board approved")
 
             # Mark approved image in design preferences
             if state.mood_image_url:
-                state.design_preferences.approved_image = state.mood_image_url
+                prefs.approved_image = state.mood_image_url
 
             # CRITICAL: Email is mandatory for CRM lead creation
             if not state.customer.email:
@@ -377,7 +703,7 @@ class DesignHenkAgent(BaseAgent):
                 # Use LLM for charming email request
                 llm_response = await self._process_with_llm(
                     state,
-                    context_message="Das Moodbild wurde genehmigt! Gratuliere dem Kunden und frage charmant nach seiner E-Mail-Adresse, um den Termin vorzubereiten."
+                    context_message=_EMAIL_REQUEST_CONTEXT,
                 )
 
                 return AgentDecision(
@@ -399,6 +725,7 @@ class DesignHenkAgent(BaseAgent):
                     "customer_email": state.customer.email,
                     "customer_phone": state.customer.phone or "",
                     "mood_image_url": state.mood_image_url,
+                    "archive_mood_image": True,
                 },
                 should_continue=True,
             )
@@ -409,7 +736,7 @@ class DesignHenkAgent(BaseAgent):
             # Use LLM for charming phase completion and appointment request
             llm_response = await self._process_with_llm(
                 state,
-                context_message="Design-Phase erfolgreich abgeschlossen! Gratuliere dem Kunden und frage, ob er den Termin lieber zu Hause oder im Büro haben möchte."
+                context_message=_DESIGN_COMPLETE_CONTEXT,
             )
 
             return AgentDecision(
@@ -431,67 +758,72 @@ class DesignHenkAgent(BaseAgent):
         """
         Extrahiere Stoffdaten aus HENK1 Payload oder RAG Context als Structured Output.
 
+        Das Ergebnis wird im ImageGenerationState gecacht, solange dieselbe
+        Stoffquelle (favorite_fabric, erster gezeigter Stoff, RAG-Stoff) gilt.
+
         Args:
             state: Session State
 
         Returns:
             SelectedFabricData - Structured fabric data for DALL-E
         """
+        return self._cached_fabric_data(state)[1]
+
+    def _fabric_data_params(self, state: SessionState) -> dict:
+        """Return ``_extract_fabric_data(state).model_dump(exclude_none=True)``."""
+        return dict(self._cached_fabric_data(state)[2])
+
+    def _cached_fabric_data(
+        self, state: SessionState
+    ) -> tuple[Optional[dict], SelectedFabricData, dict]:
+        source, kind = self._fabric_source(state)
+        cached = state.image_state._fabric_data_cache
+        if cached is not None and cached[0] is source:
+            return cached
+
+        fabric_data = self._build_fabric_data(source, kind)
+        cached = (source, fabric_data, fabric_data.model_dump(exclude_none=True))
+        state.image_state._fabric_data_cache = cached
+        return cached
+
+    @staticmethod
+    def _fabric_source(state: SessionState) -> tuple[Optional[dict], Optional[str]]:
+        """Pick the fabric dict DALL-E should use and where it came from."""
         # Priority 1: Use favorite_fabric (user's selection)
         if state.favorite_fabric:
-            fabric = state.favorite_fabric
-            logger.info(f"[DesignHenkAgent] Using favorite_fabric: {fabric.get('fabric_code')}")
-            return SelectedFabricData(
-                fabric_code=fabric.get("fabric_code"),
-                color=fabric.get("color"),
-                pattern=fabric.get("pattern"),
-                composition=fabric.get("composition"),
-                texture=fabric.get("texture"),
-                supplier=fabric.get("supplier"),
-                image_url=fabric.get("url"),  # ← WICHTIG: Stoffbild URL für Composite
-            )
+            return state.favorite_fabric, "favorite_fabric"
 
         # Priority 2: Extract from shown_fabric_images (first shown fabric)
-        if state.shown_fabric_images and len(state.shown_fabric_images) > 0:
-            fabric = state.shown_fabric_images[0]
-            logger.info(f"[DesignHenkAgent] Using first shown fabric: {fabric.get('fabric_code')}")
-            return SelectedFabricData(
-                fabric_code=fabric.get("fabric_code"),
-                color=fabric.get("color"),
-                pattern=fabric.get("pattern"),
-                composition=fabric.get("composition"),
-                texture=fabric.get("texture"),
-                supplier=fabric.get("supplier"),
-                image_url=fabric.get("url"),  # ← WICHTIG: Stoffbild URL für Composite
-            )
+        if state.shown_fabric_images:
+            return state.shown_fabric_images[0], "first shown fabric"
 
         # Priority 3: Extract from RAG context
         if state.rag_context and isinstance(state.rag_context, dict) and "fabrics" in state.rag_context:
             fabrics = state.rag_context["fabrics"]
-            if fabrics and len(fabrics) > 0:
-                main_fabric = fabrics[0]
-                # Try to get image URL from various possible keys
-                image_url = main_fabric.get("image_url") or main_fabric.get("url")
-                if not image_url:
-                    # Try local_image_paths
-                    local_paths = main_fabric.get("local_image_paths", [])
-                    if local_paths:
-                        image_url = local_paths[0]
-
-                logger.info(f"[DesignHenkAgent] Using RAG context fabric: {main_fabric.get('fabric_code')}, image_url={image_url}")
-                return SelectedFabricData(
-                    fabric_code=main_fabric.get("fabric_code"),
-                    color=main_fabric.get("color"),
-                    pattern=main_fabric.get("pattern"),
-                    composition=main_fabric.get("composition"),
-                    texture=main_fabric.get("texture"),
-                    supplier=main_fabric.get("supplier"),
-                    image_url=image_url,  # ← WICHTIG: Stoffbild URL für Composite
-                )
-
-        # Fallback: Empty SelectedFabricData
-        logger.warning("[DesignHenkAgent] No fabric data found, returning empty SelectedFabricData")
-        return SelectedFabricData()
+            if fabrics:
+                return fabrics[0], "RAG context fabric"
+
+        return None, None
+
+    @staticmethod
+    def _build_fabric_data(fabric: Optional[dict], kind: Optional[str]) -> SelectedFabricData:
+        if fabric is None:
+            # Fallback: Empty SelectedFabricData
+            logger.warning("[DesignHenkAgent] No fabric data found, returning empty SelectedFabricData")
+            return SelectedFabricData()
+
+        image_url = _fabric_image_url(fabric)
+        logger.info(
+            "[DesignHenkAgent] Using %s: %s, image_url=%s",
+            kind,
+            fabric.get("fabric_code"),
+            image_url,
+        )
+        # Catalog/RAG fabric dicts are already typed, so skip validation
+        return SelectedFabricData.model_construct(
+            **{field: fabric.get(field) for field in _FABRIC_FIELDS},
+            image_url=image_url,  # ← WICHTIG: Stoffbild URL für Composite
+        )
 
     def _extract_style_keywords(self, state: SessionState) -> list[str]:
         """
@@ -505,87 +837,73 @@ class DesignHenkAgent(BaseAgent):
         """
         keywords = []
 
-        # From HENK1 payload
-        if state.henk1_to_design_payload:
-            payload = state.henk1_to_design_payload
-
-            # Style
-            if "style" in payload:
-                style = payload["style"]
-                if hasattr(style, "value"):
-                    keywords.append(style.value)
-                else:
-                    keywords.append(str(style))
-
-            # Occasion
-            if "occasion" in payload:
-                occasion = payload["occasion"]
-                if hasattr(occasion, "value"):
-                    keywords.append(occasion.value)
-                else:
-                    keywords.append(str(occasion))
+        # From HENK1 payload (values may be enums or plain strings)
+        payload = state.henk1_to_design_payload
+        if payload:
+            for key in ("style", "occasion"):
+                value = payload.get(key)
+                if value is not None:
+                    keywords.append(getattr(value, "value", None) or str(value))
 
         # From design preferences
-        if state.design_preferences.revers_type:
-            keywords.append("klassisch" if "spitz" in state.design_preferences.revers_type.lower() else "modern")
+        revers_type = state.design_preferences.revers_type
+        if revers_type:
+            keywords.append(_revers_keyword(revers_type))
 
         # Fallback keywords
         if not keywords:
             keywords = ["elegant", "maßgeschneidert", "business"]
 
-        logger.info(f"[DesignHenkAgent] Extracted style keywords: {keywords}")
+        logger.info("[DesignHenkAgent] Extracted style keywords: %s", keywords)
         return keywords
 
     async def _extract_style_keywords_from_feedback(self, feedback: str) -> list[str]:
         """
         Extract style keywords from raw user feedback using LLM.
 
+        Trivial feedback ("ja", "passt", "👍", ...) returns [] without an LLM
+        call. Non-empty results are cached process-wide per normalized
+        feedback text, so recurring phrases skip the LLM round-trip.
+
         Args:
             feedback: User feedback message
 
         Returns:
             List of extracted style keywords
         """
-        if not feedback or AsyncOpenAI is None or not os.environ.get("OPENAI_API_KEY"):
+        client = self.client
+        if not feedback or client is None:
             return []
 
-        try:
-            client = AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-
-            system_prompt = """Extract style keywords from German user feedback for a bespoke suit.
-
-IMPORTANT: Return ONLY a JSON object with a "keywords" array. No explanations.
-
-Examples:
-Input: "modern, leicht, italienisch"
-Output: {"keywords": ["modern", "light", "italian"]}
-
-Input: "klassischer Schnitt, elegant, business"
-Output: {"keywords": ["classic", "elegant", "business"]}
-
-Input: "ohne Futter ohne Polster, aufgesetzte Taschen"
-Output: {"keywords": ["unlined", "unpadded", "patch pockets"]}
+        if _is_trivial_feedback(feedback):
+            return []
 
-Extract keywords related to:
-- Style (classic, modern, contemporary)
-- Construction (lightweight, structured, soft)
-- Regional influence (Italian, British, American)
-- Occasion (business, formal, casual)
-- Design details (patch pockets, unlined, etc.)"""
+        cache_key = normalize_phrase(feedback)
+        cached = _feedback_keyword_cache.get(cache_key)
+        if cached is not None:
+            logger.info("[DesignHenkAgent] Style keywords from cache: %s", cached)
+            return list(cached)
 
-            response = await client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": feedback}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.3,
+        try:
+            response = await self._call_llm(
+                client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "system", "content": _FEEDBACK_KEYWORDS_PROMPT},
+                        {"role": "user", "content": feedback}
+                    ],
+                    response_format=_FEEDBACK_KEYWORDS_FORMAT,
+                    temperature=0.3,
+                    extra_body=_FEEDBACK_KEYWORDS_CACHE_PARAMS,
+                )
             )
 
-            data = json.loads(response.choices[0].message.content)
+            data = _json_loads(response.choices[0].message.content)
             keywords = data.get("keywords", [])
 
+            if keywords:
+                _feedback_keyword_cache.put(cache_key, tuple(keywords))
+
             logger.info(
                 "[DesignHenkAgent] ✅ Extracted %d style keywords from feedback: %s",
                 len(keywords),
@@ -601,8 +919,18 @@ Extract keywords related to:
             )
             return []
 
-    def _get_system_prompt(self, state: SessionState) -> str:
-        """Build system prompt for Design Henk based on current context."""
+    def _get_system_prompt(self) -> str:
+        """
+        Return the static system prompt for Design Henk.
+
+        Contains no per-session data so it forms an identical prefix on every
+        request and can be served from the provider's prompt cache. Session
+        context is sent separately via ``_get_context_prompt``.
+        """
+        return DESIGN_HENK_SYSTEM_PROMPT
+
+    def _get_context_prompt(self, state: SessionState) -> str:
+        """Build the per-turn context (status, style knowledge) for Design Henk."""
         # Build context information
         fabric_info = ""
         if state.favorite_fabric:
@@ -610,22 +938,24 @@ Extract keywords related to:
             fabric_info = f"\n- Stoff: {fabric.get('fabric_code')} ({fabric.get('color')}, {fabric.get('pattern')})"
 
         design_info = ""
-        if state.design_preferences:
+        design_preferences = state.design_preferences
+        if design_preferences:
             prefs = []
-            if state.design_preferences.lapel_style:
-                prefs.append(f"Revers: {state.design_preferences.lapel_style}")
-            if state.design_preferences.shoulder_padding:
-                prefs.append(f"Schulter: {state.design_preferences.shoulder_padding}")
-            if state.design_preferences.trouser_front:
-                prefs.append(f"Hose: {state.design_preferences.trouser_front}")
+            if design_preferences.lapel_style:
+                prefs.append(f"Revers: {design_preferences.lapel_style}")
+            if design_preferences.shoulder_padding:
+                prefs.append(f"Schulter: {design_preferences.shoulder_padding}")
+            if design_preferences.trouser_front:
+                prefs.append(f"Hose: {design_preferences.trouser_front}")
             if state.wants_vest is not None:
                 prefs.append("mit Weste" if state.wants_vest else "ohne Weste")
             if prefs:
                 design_info = f"\n- Bisherige Präferenzen: {', '.join(prefs)}"
 
         iteration_info = ""
-        if state.image_state.mood_board_iteration_count > 0:
-            iteration_info = f"\n- Moodbild-Iteration: {state.image_state.mood_board_iteration_count}/7"
+        iteration_count = state.image_state.mood_board_iteration_count
+        if iteration_count > 0:
+            iteration_info = f"\n- Moodbild-Iteration: {iteration_count}/7"
 
         # Get style knowledge based on occasion
         occasion = None
@@ -634,54 +964,76 @@ Extract keywords related to:
 
         style_knowledge = self._get_style_knowledge(occasion)
 
-        return f"""Du bist Design HENK, der kreative Design-Spezialist bei LASERHENK.
-
-Deine Aufgabe - DESIGN-BERATUNG & VISUALISIERUNG:
-
-🎨 DEINE ROLLE:
-- Du bist charmant, kreativ und detailversessen
-- Du hilfst dem Kunden, seinen perfekten Anzug zu visualisieren
-- Du stellst Fragen zu Schnitt-Details (Revers, Schultern, Hose, etc.)
-- Du erstellst Moodbilder basierend auf seinen Wünschen
-- Du iterierst bis der Kunde zufrieden ist (max. 7 Iterationen)
-
-📊 AKTUELLER STATUS:{fabric_info}{design_info}{iteration_info}
-{style_knowledge}
+        return DESIGN_HENK_CONTEXT_TEMPLATE.format_map(
+            {
+                "fabric_info": fabric_info,
+                "design_info": design_info,
+                "iteration_info": iteration_info,
+                "style_knowledge": style_knowledge,
+            }
+        )
 
-💬 GESPRÄCHSFÜHRUNG:
-- Sei herzlich, persönlich und begeisternd
-- Nutze lockere Sprache ("du", emoji 🎩✨)
-- Erkläre Design-Optionen verständlich
-- Reagiere auf ALLE Kundenfragen (Preis, Lieferzeit, Details, etc.)
-- Gehe auf Feedback ein und passe das Moodbild an
+    def _build_llm_messages(
+        self, state: SessionState, context_message: str = ""
+    ) -> list[dict]:
+        """
+        Build the chat messages for an LLM turn (prompts, context, history).
 
-🎯 DESIGN-DETAILS ZU KLÄREN:
-1. Revers-Stil (Spitzrevers, Stegrevers, Schalkragen)
-2. Schulterpolsterung (keine, leicht, mittel, stark)
-3. Hosenbund (Bundfalte, glatt)
-4. Weste (ja/nein)
-5. Weitere Präferenzen (Knopfanzahl, Taschenstil)
+        Layout: static system prompt, history, per-turn context, latest user
+        message. Keeping the dynamic context behind the history lets the
+        provider's prefix cache cover the system prompt and all earlier turns.
+        """
+        messages = [{"role": "system", "content": self._get_system_prompt()}]
+
+        # Add conversation history (at least the last 10 messages) and find
+        # the latest user message in the same pass. The window start only
+        # moves in steps of _HISTORY_WINDOW, so consecutive turns share a
+        # byte-identical prefix for the provider's prompt cache instead of
+        # shifting by one message every turn.
+        history = state.conversation_history
+        start = max(0, len(history) - _HISTORY_WINDOW) // _HISTORY_WINDOW * _HISTORY_WINDOW
+        user_input = None
+        sent_user_contents = set()
+        for msg in history[start:]:
+            content = msg.get("content", "")
+            if msg.get("role") == "user":
+                user_input = content
+            if content:
+                role = "assistant" if msg.get("sender") in ("design_henk", "system") else "user"
+                messages.append({"role": role, "content": content})
+                if role == "user":
+                    sent_user_contents.add(content)
+
+        if user_input is None:
+            # Latest user message is older than the window
+            user_input = ""
+            for msg in reversed(history[:start]):
+                if msg.get("role") == "user":
+                    user_input = msg.get("content", "")
+                    break
 
-📸 MOODBILD-ITERATION:
-- Nach jedem Feedback: Erkläre kurz, was du änderst
-- Sei positiv und motivierend
-- Zeige Verständnis für Kundenwünsche
-- Wenn zufrieden → Lead sichern & Termin vereinbaren
+        # Add current user input if not already in history
+        if user_input and user_input not in sent_user_contents:
+            messages.append({"role": "user", "content": user_input})
 
-💰 PREISE (wenn gefragt):
-- Einstieg: ab 899€ (2-Teiler, Standardstoffe)
-- Premium: 1.200-2.500€ (hochwertige Stoffe, mehr Details)
-- Luxus: 2.500€+ (exklusive Stoffe, alle Details)
-- Hinweis: "Genauer Preis wird im persönlichen Termin besprochen"
+        # Per-turn context goes right before the latest user message
+        context = [{"role": "system", "content": self._get_context_prompt(state)}]
+        if context_message:
+            context.append({"role": "system", "content": f"CONTEXT: {context_message}"})
+        insert_at = len(messages) - 1 if messages[-1]["role"] == "user" else len(messages)
+        messages[insert_at:insert_at] = context
 
-⏱️ LIEFERZEIT (wenn gefragt):
-- Standardproduktion: 4-6 Wochen
-- Express: 2-3 Wochen (gegen Aufpreis)
-- Bei Termindruck: "Wir finden eine Lösung!"
+        return messages
 
-Wichtig: Antworte IMMER auf Deutsch, kurz, charmant und hilfreich!
+    @staticmethod
+    def _prompt_cache_params(state: SessionState) -> dict:
+        """
+        Route a session's turns to the same OpenAI prompt cache.
 
-{IMAGE_SYSTEM_CONTRACT}"""
+        Sent via ``extra_body`` so older SDKs without the
+        ``prompt_cache_key`` argument pass it through unchanged.
+        """
+        return {"prompt_cache_key": f"design_henk:{state.session_id}"}
 
     async def _process_with_llm(
         self, state: SessionState, context_message: str = ""
@@ -698,44 +1050,25 @@ Wichtig: Antworte IMMER auf Deutsch, kurz, charmant und hilfreich!
         """
         if not self.client:
             # Fallback if no client available
-            return "Lass uns über die Design-Details deines Anzugs sprechen!"
+            return _LLM_FALLBACK_MESSAGE
 
-        # Get latest user message
-        user_input = ""
-        for msg in reversed(state.conversation_history):
-            if isinstance(msg, dict) and msg.get("role") == "user":
-                user_input = msg.get("content", "")
-                break
+        messages = self._build_llm_messages(state, context_message)
 
-        # Build conversation context
-        messages = [
-            {"role": "system", "content": self._get_system_prompt(state)},
-        ]
-
-        # Add context message if provided
-        if context_message:
-            messages.append({"role": "system", "content": f"CONTEXT: {context_message}"})
-
-        # Add conversation history (last 10 messages)
-        for msg in state.conversation_history[-10:]:
-            if isinstance(msg, dict):
-                role = "assistant" if msg.get("sender") in ["design_henk", "system"] else "user"
-                content = msg.get("content", "")
-                if content:
-                    messages.append({"role": role, "content": content})
-
-        # Add current user input if not already in history
-        if user_input and not any(
-            isinstance(m, dict) and m.get("role") == "user" and m.get("content") == user_input
-            for m in messages
-        ):
-            messages.append({"role": "user", "content": user_input})
+        cache_key = _reply_cache_key(messages) if _reply_cache_enabled() else None
+        if cache_key is not None:
+            cached = _reply_cache.get(cache_key)
+            if cached is not None:
+                logger.info("[DesignHenk] ✅ LLM response from reply cache")
+                return cached
 
         try:
-            response = await self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=messages,
-                temperature=0.7,
+            response = await self._call_llm(
+                self.client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=messages,
+                    temperature=0.7,
+                    extra_body=self._prompt_cache_params(state),
+                )
             )
             llm_response = response.choices[0].message.content
 
@@ -744,43 +1077,22 @@ Wichtig: Antworte IMMER auf Deutsch, kurz, charmant und hilfreich!
                 len(llm_response)
             )
 
+            if cache_key is not None and llm_response:
+                _reply_cache.put(cache_key, llm_response)
+
             return llm_response
 
         except Exception as exc:
             logger.warning("[DesignHenk] LLM call failed: %s", exc)
-            return "Lass uns über die Design-Details deines Anzugs sprechen!"
-
-    def _load_style_catalog(self) -> dict:
-        """
-        Load style catalog from knowledge base.
-
-        Returns:
-            Style catalog dict or empty dict if failed
-        """
-        catalog_path = os.path.join(
-            os.path.dirname(__file__),
-            "..",
-            "drive_mirror",
-            "henk",
-            "knowledge",
-            "style_catalog.json"
-        )
-
-        try:
-            with open(catalog_path, "r", encoding="utf-8") as f:
-                catalog = json.load(f)
-                return catalog
-        except FileNotFoundError:
-            logger.warning("[DesignHenk] Style catalog not found at %s", catalog_path)
-            return {}
-        except Exception as exc:
-            logger.warning("[DesignHenk] Failed to load style catalog: %s", exc)
-            return {}
+            return _LLM_FALLBACK_MESSAGE
 
     def _get_style_knowledge(self, occasion: str = None) -> str:
         """
         Get relevant style knowledge based on occasion.
 
+        The dress code blocks and the overview are rendered once per catalog
+        (see ``_dress_code_blocks``); only the occasion header is built here.
+
         Args:
             occasion: Optional occasion to filter (e.g., "Hochzeit", "Business", "Gala")
 
@@ -790,44 +1102,14 @@ Wichtig: Antworte IMMER auf Deutsch, kurz, charmant und hilfreich!
         if not self.style_catalog:
             return ""
 
-        dress_codes = self.style_catalog.get("dress_codes", {})
-
         # If specific occasion provided, try to match dress code
         if occasion:
-            occasion_lower = occasion.lower()
-
-            # Map occasions to dress codes
-            occasion_mapping = {
-                "hochzeit": "formal_evening",
-                "gala": "formal_evening",
-                "business": "business_formal",
-                "vorstellungsgespräch": "business_formal",
-                "arbeit": "business_casual",
-                "meeting": "business_casual",
-                "freizeit": "smart_casual",
-                "restaurant": "smart_casual",
-            }
-
-            # Find matching dress code
-            for key, dress_code_key in occasion_mapping.items():
-                if key in occasion_lower:
-                    if dress_code_key in dress_codes:
-                        dc = dress_codes[dress_code_key]
-                        return f"""
-📋 EMPFEHLUNG FÜR {occasion.upper()}:
-- Stil: {dc['name']}
-- Erforderlich: {', '.join(dc.get('required_items', []))}
-- Farben: {', '.join(dc.get('color_palette', []))}
-- Stoffe: {', '.join(dc.get('fabric_recommendations', []))}
-"""
+            blocks = _dress_code_blocks(self.style_catalog)
+            # One regex pass finds every keyword; the map order decides
+            found = set(_OCCASION_RE.findall(occasion.lower()))
+            for key, dress_code_key in _OCCASION_DRESS_CODES.items():
+                if key in found and dress_code_key in blocks:
+                    return f"\n📋 EMPFEHLUNG FÜR {occasion.upper()}:\n{blocks[dress_code_key]}"
 
         # Otherwise, return general overview
-        knowledge = "\n📚 VERFÜGBARE DRESS CODES:\n"
-        for code_key, code_data in dress_codes.items():
-            occasions = code_data.get('occasions', [])
-            colors = code_data.get('color_palette', [])
-            knowledge += f"\n{code_data['name']}:\n"
-            knowledge += f"  - Anlässe: {', '.join(occasions[:3])}\n"
-            knowledge += f"  - Farben: {', '.join(colors[:3])}\n"
-
-        return knowledge
+        return _dress_code_overview(self.style_catalog)
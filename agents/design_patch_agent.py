@@ -2,30 +2,195 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import os
 from typing import Optional
 
+from agents.base import LRUCache, normalize_phrase
 from models.patches import PatchDecision
 
 logger = logging.getLogger(__name__)
 
-try:  # Optional dependency: allow offline fallback
-    from pydantic_ai import Agent as PydanticAgent  # type: ignore
-except ModuleNotFoundError:  # pragma: no cover - exercised via offline path
-    PydanticAgent = None
+# Pydantic-AI is imported on first DesignPatchAgent construction with an API
+# key: the import alone takes about a second, and offline runs never need it.
+PydanticAgent = None
+_PYDANTIC_AI_IMPORTED = False
+
+
+def _load_pydantic_agent() -> Optional[type]:
+    """Return ``pydantic_ai.Agent``, importing it once; None if not installed."""
+    global PydanticAgent, _PYDANTIC_AI_IMPORTED
+    if not _PYDANTIC_AI_IMPORTED:
+        _PYDANTIC_AI_IMPORTED = True
+        try:  # Optional dependency: allow offline fallback
+            from pydantic_ai import Agent as PydanticAgent  # type: ignore
+        except ModuleNotFoundError:  # pragma: no cover - exercised via offline path
+            PydanticAgent = None
+    return PydanticAgent
 
 try:
     from openai import AsyncOpenAI
 except ModuleNotFoundError:
     AsyncOpenAI = None
 
+_SYSTEM_PROMPT = """Du bist ein Experte für die Extraktion von Design-Präferenzen aus Nutzerfeedback.
+
+AUFGABE:
+Extrahiere strukturierte PatchDecision aus dem Nutzerfeedback und gib confidence + changed_fields zurück.
+
+MAPPING-REGELN (Deutsche Synonyme → Strukturierte Felder):
+
+**Jacket Front (jacket_front):**
+- "Einreiher" | "einreihig" | "single-breasted" | "eine Knopfreihe" → "single_breasted"
+- "Zweireiter" | "zweireihig" | "double-breasted" | "zwei Knopfreihen" → "double_breasted"
+
+**Lapel Style (lapel_style):**
+- "Spitzrevers" | "Peak" | "peak lapel" → "peak"
+- "Stegrevers" | "Schlitzrevers" | "Notch" → "notch"
+- "Schalkragen" | "Shawl" → "shawl"
+
+**Lapel Roll (lapel_roll):**
+- "fallendes Revers" | "rollierendes Revers" | "Facon" | "rolling lapel" → "rolling"
+- "flaches Revers" | "flat lapel" → "flat"
+
+**Shoulder Padding (shoulder_padding):**
+- "ohne Schulterpolster" | "keine Polster" | "spalla camicia" → "none"
+- "leicht" | "light" | "minimal" → "light"
+- "mittel" | "medium" | "normal" → "medium"
+- "stark" | "structured" | "ausgeprägt" → "structured"
+
+**Trouser Front (trouser_front):**
+- "Bundfalte" | "Falten" | "pleats" | "mit Falte" → "pleats"
+- "glatt" | "ohne Falte" | "flat front" → "flat_front"
+
+**Trouser Color (trouser_color):**
+- "dunkelblau" | "marine" | "navy" → "navy_blue"
+- "blau" → "blue"
+- "schwarz" → "black"
+- "grau" → "grey"
+- "beige" → "beige"
+- "braun" → "brown"
+
+**Vest/Waistcoat (wants_vest):**
+- "ohne Weste" | "kein Gilet" | "Zweiteiler" | "no vest" → false
+- "mit Weste" | "Gilet" | "Dreiteiler" | "with vest" → true
+
+**Neckwear (neckwear):**
+- "Fliege" | "Schleife" | "bow tie" → "bow_tie"
+- "Krawatte" | "tie" → "tie"
+- "ohne" | "none" → "none"
+
+**Button Count (button_count):**
+- "ein Knopf" | "single button" → 1
+- "zwei Knöpfe" | "two buttons" → 2
+- "drei Knöpfe" | "three buttons" → 3
+
+**Fabric Code (requested_fabric_code):**
+- "anderer Stoff: XXXXX" | "Stoff: XXXXX" | "neuer Stoff XXXXX" → extract "XXXXX"
+- Fabric codes are typically alphanumeric (e.g., "50C4022", "10M5000", "20W3000")
+- Extract EXACTLY as user provides it (case-sensitive)
+- Examples:
+  - "Nein, anderer Stoff: 50C4022" → requested_fabric_code="50C4022"
+  - "lieber Stoff 10M5000" → requested_fabric_code="10M5000"
+
+**Preferred Material (preferred_material):**
+- "Kaschmir" | "cashmere" → "cashmere"
+- "Wolle" | "wool" → "wool"
+- "Leinen" | "linen" → "linen"
+- "Baumwolle" | "cotton" → "cotton"
+- "Seide" | "silk" → "silk"
+
+WICHTIGE REGELN:
+1. Erkenne deutsche Synonyme, Flexionen und Tippfehler (z.B. "schulterpolter", "fallende revers")
+2. Setze confidence=0.0 wenn unklar, confidence=0.5-0.8 wenn teilweise sicher, confidence=0.9-1.0 wenn sehr sicher
+3. Fülle changed_fields[] mit allen geänderten Feldern (z.B. ["jacket_front", "lapel_roll"])
+4. Bevorzuge 'unknown' statt Halluzinationen bei Unsicherheit
+5. Kein RAG, keine Datenbankabfragen - nur das User-Feedback analysieren
+
+BEISPIELE:
+
+Input: "bitte nochmal als Einreiher und mit fallendem Revers"
+Output:
+{
+  "patch": {
+    "jacket_front": "single_breasted",
+    "lapel_roll": "rolling"
+  },
+  "confidence": 0.95,
+  "changed_fields": ["jacket_front", "lapel_roll"]
+}
+
+Input: "ohne Weste bitte"
+Output:
+{
+  "patch": {
+    "wants_vest": false
+  },
+  "session_patch": {
+    "wants_vest": false
+  },
+  "confidence": 1.0,
+  "changed_fields": ["wants_vest"]
+}
+
+Input: "modern, leicht, italienisch, ohne Futter ohne Polster"
+Output:
+{
+  "patch": {
+    "shoulder_padding": "none",
+    "notes_normalized": "modern italienisch leicht ohne Futter"
+  },
+  "confidence": 0.85,
+  "changed_fields": ["shoulder_padding", "notes_normalized"]
+}
+
+Input: "Nein, anderer Stoff: 50C4022"
+Output:
+{
+  "patch": {
+    "requested_fabric_code": "50C4022"
+  },
+  "confidence": 0.95,
+  "changed_fields": ["requested_fabric_code"]
+}
+"""
+
+# The mapping-rule system prompt is identical for every session, so all
+# extraction calls share one OpenAI prompt cache bucket; only the short user
+# feedback after it changes per request.
+_PROMPT_CACHE_PARAMS = {"prompt_cache_key": "design_patch"}
+
+# Process-wide LRU of (context, normalized feedback) → confident PatchDecision.
+# Short phrases like "ohne Weste" or "Spitzrevers bitte" recur across sessions.
+# Decisions that carry a fabric code are not cached: codes are case-sensitive
+# while the key is not.
+_DECISION_CACHE_MIN_CONFIDENCE = 0.8
+_decision_cache = LRUCache(2048)
+
+
+def _decision_cache_key(user_message: str, context: Optional[str]) -> tuple[str, str]:
+    return context or "", normalize_phrase(user_message)
+
+
+def _remember_decision(key: tuple[str, str], decision: PatchDecision) -> None:
+    if (
+        not key[1]
+        or decision.confidence < _DECISION_CACHE_MIN_CONFIDENCE
+        or decision.patch.requested_fabric_code
+    ):
+        return
+    _decision_cache.put(key, decision.model_copy(deep=True))
+
 
 class DesignPatchAgent:
     """Extract structured design patches from user feedback using Pydantic-AI or OpenAI Structured Outputs."""
 
-    def __init__(self, model: str = "openai:gpt-4o-mini", temperature: float = 0.0):
+    def __init__(
+        self,
+        model: str = "openai:gpt-4o-mini",
+        temperature: float = 0.0,
+        openai_client: Optional["AsyncOpenAI"] = None,
+    ):
         self.model = model
         self.temperature = temperature
         self.pydantic_agent = None
@@ -33,10 +198,11 @@ class DesignPatchAgent:
         self.use_structured_outputs = False
 
         # Try Pydantic-AI first (modern API)
-        if PydanticAgent is not None and os.environ.get("OPENAI_API_KEY"):
+        pydantic_agent_cls = _load_pydantic_agent() if os.environ.get("OPENAI_API_KEY") else None
+        if pydantic_agent_cls is not None:
             try:
                 system_prompt = self._build_system_prompt()
-                self.pydantic_agent = PydanticAgent(
+                self.pydantic_agent = pydantic_agent_cls(
                     model,
                     result_type=PatchDecision,
                     system_prompt=system_prompt,
@@ -48,13 +214,15 @@ class DesignPatchAgent:
                     exc,
                 )
                 self.pydantic_agent = None
-        elif PydanticAgent is None:
+        elif os.environ.get("OPENAI_API_KEY"):
             logger.info("[DesignPatchAgent] pydantic_ai not installed. Using OpenAI Structured Outputs.")
 
         # Fallback to OpenAI Structured Outputs
         if self.pydantic_agent is None and AsyncOpenAI is not None and os.environ.get("OPENAI_API_KEY"):
             try:
-                self.openai_client = AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+                self.openai_client = openai_client or AsyncOpenAI(
+                    api_key=os.environ.get("OPENAI_API_KEY")
+                )
                 self.use_structured_outputs = True
                 logger.info("[DesignPatchAgent] ✅ Initialized with OpenAI Structured Outputs (beta)")
             except Exception as exc:
@@ -78,6 +246,12 @@ class DesignPatchAgent:
         if not user_message:
             return PatchDecision(confidence=0.0)
 
+        cache_key = _decision_cache_key(user_message, context)
+        cached = _decision_cache.get(cache_key)
+        if cached is not None:
+            logger.info("[DesignPatchAgent] PatchDecision from cache: %s", cached.changed_fields)
+            return cached.model_copy(deep=True)
+
         # Route 1: Pydantic-AI
         if self.pydantic_agent is not None:
             try:
@@ -90,9 +264,10 @@ class DesignPatchAgent:
                         decision.confidence,
                         decision.changed_fields,
                     )
-                    return decision
-
-                return PatchDecision.model_validate(decision)
+                else:
+                    decision = PatchDecision.model_validate(decision)
+                _remember_decision(cache_key, decision)
+                return decision
             except Exception as exc:
                 logger.warning(
                     "[DesignPatchAgent] Pydantic-AI extraction failed: %s. Trying fallback.",
@@ -102,7 +277,9 @@ class DesignPatchAgent:
         # Route 2: OpenAI Structured Outputs (beta)
         if self.use_structured_outputs and self.openai_client is not None:
             try:
-                return await self._extract_via_structured_outputs(user_message)
+                decision = await self._extract_via_structured_outputs(user_message)
+                _remember_decision(cache_key, decision)
+                return decision
             except Exception as exc:
                 logger.warning(
                     "[DesignPatchAgent] OpenAI Structured Outputs extraction failed: %s",
@@ -139,6 +316,7 @@ class DesignPatchAgent:
             ],
             response_format=PatchDecision,
             temperature=self.temperature,
+            extra_body=_PROMPT_CACHE_PARAMS,
         )
 
         decision = completion.choices[0].message.parsed
@@ -152,125 +330,9 @@ class DesignPatchAgent:
         return decision
 
     def _build_system_prompt(self, context: Optional[str] = None) -> str:
-        """Build system prompt for PatchDecision extraction."""
-        return """Du bist ein Experte für die Extraktion von Design-Präferenzen aus Nutzerfeedback.
-
-AUFGABE:
-Extrahiere strukturierte PatchDecision aus dem Nutzerfeedback und gib confidence + changed_fields zurück.
-
-MAPPING-REGELN (Deutsche Synonyme → Strukturierte Felder):
-
-**Jacket Front (jacket_front):**
-- "Einreiher" | "einreihig" | "single-breasted" | "eine Knopfreihe" → "single_breasted"
-- "Zweireiter" | "zweireihig" | "double-breasted" | "zwei Knopfreihen" → "double_breasted"
-
-**Lapel Style (lapel_style):**
-- "Spitzrevers" | "Peak" | "peak lapel" → "peak"
-- "Stegrevers" | "Schlitzrevers" | "Notch" → "notch"
-- "Schalkragen" | "Shawl" → "shawl"
-
-**Lapel Roll (lapel_roll):**
-- "fallendes Revers" | "rollierendes Revers" | "Facon" | "rolling lapel" → "rolling"
-- "flaches Revers" | "flat lapel" → "flat"
-
-**Shoulder Padding (shoulder_padding):**
-- "ohne Schulterpolster" | "keine Polster" | "spalla camicia" → "none"
-- "leicht" | "light" | "minimal" → "light"
-- "mittel" | "medium" | "normal" → "medium"
-- "stark" | "structured" | "ausgeprägt" → "structured"
-
-**Trouser Front (trouser_front):**
-- "Bundfalte" | "Falten" | "pleats" | "mit Falte" → "pleats"
-- "glatt" | "ohne Falte" | "flat front" → "flat_front"
-
-**Trouser Color (trouser_color):**
-- "dunkelblau" | "marine" | "navy" → "navy_blue"
-- "blau" → "blue"
-- "schwarz" → "black"
-- "grau" → "grey"
-- "beige" → "beige"
-- "braun" → "brown"
-
-**Vest/Waistcoat (wants_vest):**
-- "ohne Weste" | "kein Gilet" | "Zweiteiler" | "no vest" → false
-- "mit Weste" | "Gilet" | "Dreiteiler" | "with vest" → true
-
-**Neckwear (neckwear):**
-- "Fliege" | "Schleife" | "bow tie" → "bow_tie"
-- "Krawatte" | "tie" → "tie"
-- "ohne" | "none" → "none"
-
-**Button Count (button_count):**
-- "ein Knopf" | "single button" → 1
-- "zwei Knöpfe" | "two buttons" → 2
-- "drei Knöpfe" | "three buttons" → 3
-
-**Fabric Code (requested_fabric_code):**
-- "anderer Stoff: XXXXX" | "Stoff: XXXXX" | "neuer Stoff XXXXX" → extract "XXXXX"
-- Fabric codes are typically alphanumeric (e.g., "50C4022", "10M5000", "20W3000")
-- Extract EXACTLY as user provides it (case-sensitive)
-- Examples:
-  - "Nein, anderer Stoff: 50C4022" → requested_fabric_code="50C4022"
-  - "lieber Stoff 10M5000" → requested_fabric_code="10M5000"
-
-**Preferred Material (preferred_material):**
-- "Kaschmir" | "cashmere" → "cashmere"
-- "Wolle" | "wool" → "wool"
-- "Leinen" | "linen" → "linen"
-- "Baumwolle" | "cotton" → "cotton"
-- "Seide" | "silk" → "silk"
-
-WICHTIGE REGELN:
-1. Erkenne deutsche Synonyme, Flexionen und Tippfehler (z.B. "schulterpolter", "fallende revers")
-2. Setze confidence=0.0 wenn unklar, confidence=0.5-0.8 wenn teilweise sicher, confidence=0.9-1.0 wenn sehr sicher
-3. Fülle changed_fields[] mit allen geänderten Feldern (z.B. ["jacket_front", "lapel_roll"])
-4. Bevorzuge 'unknown' statt Halluzinationen bei Unsicherheit
-5. Kein RAG, keine Datenbankabfragen - nur das User-Feedback analysieren
-
-BEISPIELE:
-
-Input: "bitte nochmal als Einreiher und mit fallendem Revers"
-Output:
-{
-  "patch": {
-    "jacket_front": "single_breasted",
-    "lapel_roll": "rolling"
-  },
-  "confidence": 0.95,
-  "changed_fields": ["jacket_front", "lapel_roll"]
-}
+        """Return the static PatchDecision system prompt.
 
-Input: "ohne Weste bitte"
-Output:
-{
-  "patch": {
-    "wants_vest": false
-  },
-  "session_patch": {
-    "wants_vest": false
-  },
-  "confidence": 1.0,
-  "changed_fields": ["wants_vest"]
-}
-
-Input: "modern, leicht, italienisch, ohne Futter ohne Polster"
-Output:
-{
-  "patch": {
-    "shoulder_padding": "none",
-    "notes_normalized": "modern italienisch leicht ohne Futter"
-  },
-  "confidence": 0.85,
-  "changed_fields": ["shoulder_padding", "notes_normalized"]
-}
-
-Input: "Nein, anderer Stoff: 50C4022"
-Output:
-{
-  "patch": {
-    "requested_fabric_code": "50C4022"
-  },
-  "confidence": 0.95,
-  "changed_fields": ["requested_fabric_code"]
-}
-"""
+        Per-call context is never merged in, so the prompt stays a byte-identical
+        cacheable prefix across all sessions.
+        """
+        return _SYSTEM_PROMPT
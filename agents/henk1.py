@@ -71,20 +71,18 @@ BEISPIEL-ABLAUF:
 
 import json
 import logging
-import os
 import re
 from datetime import datetime
 from typing import Optional
 
-from openai import AsyncOpenAI
-
 from agents.base import AgentDecision, BaseAgent
+from agents.openai_client import get_openai_client
 from agents.henk1_preferences import (
     IntentAnalysis,
     INTENT_EXTRACTION_PROMPT,
     fallback_intent_analysis,
 )
-from models.customer import SessionState
+from models.customer import PROVISIONAL_LEAD_PREFIX, SessionState
 from models.fabric import FabricColor, FabricPattern
 from models.handoff import Henk1ToDesignHenkPayload, OccasionType, StyleType
 from tools.rag_tool import _find_local_image
@@ -104,11 +102,12 @@ class Henk1Agent(BaseAgent):
     - Erste Bildgenerierung mit wenigen Kundeninfos
     """
 
+    __slots__ = ("client",)
+
     def __init__(self):
         """Initialize HENK1 Agent."""
         super().__init__("henk1")
-        api_key = os.getenv("OPENAI_API_KEY")
-        self.client = AsyncOpenAI(api_key=api_key) if api_key else None
+        self.client = get_openai_client()
 
     async def process(self, state: SessionState) -> AgentDecision:
         """
@@ -333,10 +332,12 @@ class Henk1Agent(BaseAgent):
             messages.append({"role": "user", "content": user_input})
 
         if self.client:
-            response = await self.client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=messages,
-                temperature=0.7,
+            response = await self._call_llm(
+                self.client.chat.completions.create(
+                    model="gpt-4-turbo-preview",
+                    messages=messages,
+                    temperature=0.7,
+                )
             )
 
             llm_response = response.choices[0].message.content
@@ -649,22 +650,24 @@ Wichtig: Antworte IMMER auf Deutsch, kurz und freundlich."""
             return fallback_intent_analysis(user_input, state.conversation_history)
 
         try:
-            response = await self.client.chat.completions.create(
-                model="gpt-4.1-mini",
-                temperature=0.2,
-                response_format={"type": "json_object"},
-                messages=[
-                    {"role": "system", "content": INTENT_EXTRACTION_PROMPT},
-                    {
-                        "role": "user",
-                        "content": json.dumps(
-                            {
-                                "latest_user_message": user_input,
-                                "conversation_snippet": state.conversation_history[-8:],
-                            }
-                        ),
-                    },
-                ],
+            response = await self._call_llm(
+                self.client.chat.completions.create(
+                    model="gpt-4.1-mini",
+                    temperature=0.2,
+                    response_format={"type": "json_object"},
+                    messages=[
+                        {"role": "system", "content": INTENT_EXTRACTION_PROMPT},
+                        {
+                            "role": "user",
+                            "content": json.dumps(
+                                {
+                                    "latest_user_message": user_input,
+                                    "conversation_snippet": state.conversation_history[-8:],
+                                }
+                            ),
+                        },
+                    ],
+                )
             )
 
             raw = response.choices[0].message.content or "{}"
@@ -691,7 +694,7 @@ Wichtig: Antworte IMMER auf Deutsch, kurz und freundlich."""
         )
 
         if should_capture and not already_captured:
-            state.customer.crm_lead_id = f"HENK1_LEAD_{state.session_id[:8]}"
+            state.customer.crm_lead_id = f"{PROVISIONAL_LEAD_PREFIX}{state.session_id[:8]}"
             logger.info("[HENK1] Lead provisional secured during needs assessment")
 
     def _contact_request(self, state: SessionState, intent: IntentAnalysis) -> Optional[str]:
@@ -873,7 +876,7 @@ Wichtig: Antworte IMMER auf Deutsch, kurz und freundlich."""
             else:
                 style_info["style_keywords"] = ["modern", "vielseitig"]
 
-        logger.info(f"[HENK1] Extracted style info: {style_info}")
+        logger.info("[HENK1] Extracted style info: %s", style_info)
         return style_info
 
     def _build_fabric_title(self, tier: str, occasion: Optional[str], styles: list[str]) -> str:
@@ -1199,7 +1202,7 @@ Wichtig: Antworte IMMER auf Deutsch, kurz und freundlich."""
         has_color = any(keyword in text for keyword in color_keywords)
 
         if has_rejection and has_color:
-            logger.info(f"[HENK1] Rejection + color detected in '{text}', triggering new fabric search")
+            logger.info("[HENK1] Rejection + color detected in '%s', triggering new fabric search", text)
             return True
 
         return False
@@ -1,8 +1,12 @@
 """LLM-gestützte Intent-Extraktion für HENK1."""
 
+import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Iterable
 
+from agents.base import keyword_re
+
 
 INTENT_EXTRACTION_PROMPT = """
 Analysiere die Nachricht und gib kompaktes JSON zurück:
@@ -25,61 +29,82 @@ class IntentAnalysis:
     lead_ready: bool = False
 
 
+FABRIC_KEYWORDS = (
+    "stoff",
+    "stoffe",
+    "zeigen",
+    "auswahl",
+    "empfehl",
+    "option",
+    "material",
+    "sehen",
+)
+
+COLOR_KEYWORDS = {
+    "blau": "Blue",
+    "grau": "Grey",
+    "schwarz": "Black",
+    "braun": "Brown",
+    "beige": "Beige",
+    "grün": "Green",
+}
+
+PATTERN_KEYWORDS = {
+    "uni": "Solid",
+    "einfarbig": "Solid",
+    "streifen": "Stripes",
+    "karo": "Check",
+    "fischgrat": "Herringbone",
+}
+
+
+_FABRIC_RE = keyword_re(FABRIC_KEYWORDS)
+_COLOR_RE = keyword_re(COLOR_KEYWORDS)
+_PATTERN_RE = keyword_re(PATTERN_KEYWORDS)
+
+
+def _matched_labels(pattern: re.Pattern, mapping: dict, text_lower: str) -> tuple[str, ...]:
+    """Labels of all keywords found in ``text_lower``, in mapping order, deduplicated."""
+    found = set(pattern.findall(text_lower))
+    if not found:
+        return ()
+    return tuple(dict.fromkeys(label for keyword, label in mapping.items() if keyword in found))
+
+
+@lru_cache(maxsize=512)
+def _color_pattern_labels(text_lower: str) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """(colors, patterns) mentioned in one lowercased message.
+
+    Cached because the history fallback rescans the same messages every turn.
+    """
+    return (
+        _matched_labels(_COLOR_RE, COLOR_KEYWORDS, text_lower),
+        _matched_labels(_PATTERN_RE, PATTERN_KEYWORDS, text_lower),
+    )
+
+
+def _merge(target: list[str], labels: tuple[str, ...]) -> None:
+    for label in labels:
+        if label not in target:
+            target.append(label)
+
+
 def fallback_intent_analysis(user_input: str, history: Iterable[dict]) -> IntentAnalysis:
     """Regelbasierter Fallback ohne LLM-Abhängigkeit."""
 
     user_input_lower = user_input.lower()
 
-    fabric_keywords = [
-        "stoff",
-        "stoffe",
-        "zeigen",
-        "auswahl",
-        "empfehl",
-        "option",
-        "material",
-        "sehen",
-    ]
-
-    color_keywords = {
-        "blau": "Blue",
-        "grau": "Grey",
-        "schwarz": "Black",
-        "braun": "Brown",
-        "beige": "Beige",
-        "grün": "Green",
-    }
-
-    pattern_keywords = {
-        "uni": "Solid",
-        "einfarbig": "Solid",
-        "streifen": "Stripes",
-        "karo": "Check",
-        "fischgrat": "Herringbone",
-    }
-
-    wants_fabrics = any(keyword in user_input_lower for keyword in fabric_keywords)
-
-    colors: list[str] = []
-    patterns: list[str] = []
-
-    for keyword, color in color_keywords.items():
-        if keyword in user_input_lower and color not in colors:
-            colors.append(color)
-
-    for keyword, pattern in pattern_keywords.items():
-        if keyword in user_input_lower and pattern not in patterns:
-            patterns.append(pattern)
+    wants_fabrics = _FABRIC_RE.search(user_input_lower) is not None
+
+    input_colors, input_patterns = _color_pattern_labels(user_input_lower)
+    colors = list(input_colors)
+    patterns = list(input_patterns)
 
     if not colors or not patterns:
         for msg in history or []:
-            content = msg.get("content", "").lower()
-            for keyword, color in color_keywords.items():
-                if keyword in content and color not in colors:
-                    colors.append(color)
-            for keyword, pattern in pattern_keywords.items():
-                if keyword in content and pattern not in patterns:
-                    patterns.append(pattern)
+            msg_colors, msg_patterns = _color_pattern_labels(msg.get("content", "").lower())
+            _merge(colors, msg_colors)
+            _merge(patterns, msg_patterns)
 
     lead_ready = wants_fabrics and len(list(history or [])) >= 4
 
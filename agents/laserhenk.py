@@ -13,6 +13,8 @@ class LaserHenkAgent(BaseAgent):
     - Human-in-the-Loop (HITL): Termin beim Kunden vereinbaren
     """
 
+    __slots__ = ()
+
     def __init__(self):
         """Initialize LASERHENK Agent."""
         super().__init__("laserhenk")
@@ -0,0 +1,69 @@
+"""Process-wide AsyncOpenAI client shared by the chat agents."""
+
+import asyncio
+import logging
+import os
+from typing import Optional
+
+try:
+    import httpx
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+except ModuleNotFoundError:  # pragma: no cover - environment without the SDK
+    AsyncOpenAI = None
+
+logger = logging.getLogger(__name__)
+
+# Shared so Design HENK and HENK1 reuse one connection pool instead of paying
+# TCP + TLS setup for a fresh AsyncOpenAI on every agent construction.
+_openai_client: Optional["AsyncOpenAI"] = None
+# Event loop the pooled connections belong to (None until first used in a loop)
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ModuleNotFoundError:
+        return False
+    return True
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def get_openai_client() -> Optional["AsyncOpenAI"]:
+    """Return the shared AsyncOpenAI client, or None without SDK/API key."""
+    global _openai_client, _client_loop
+    loop = _running_loop()
+    if loop is not None and _client_loop is not None and loop is not _client_loop:
+        # httpx connections cannot cross event loops (e.g. a second asyncio.run)
+        logger.info("[OpenAIClient] Event loop changed, creating a new client")
+        _openai_client = None
+    if _openai_client is None and AsyncOpenAI is not None:
+        api_key = os.environ.get("OPENAI_API_KEY")
+        if api_key:
+            _openai_client = AsyncOpenAI(
+                api_key=api_key,
+                # SDK defaults (timeouts, redirects), plus HTTP/2 multiplexing
+                # when the optional h2 package is installed
+                http_client=DefaultAsyncHttpxClient(
+                    http2=_http2_available(),
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                ),
+            )
+            logger.info("[OpenAIClient] Shared AsyncOpenAI client created")
+    if _openai_client is not None and loop is not None:
+        _client_loop = loop
+    return _openai_client
+
+
+async def close_openai_client() -> None:
+    """Close the shared client's connection pool; the next call creates a new one."""
+    global _openai_client, _client_loop
+    client, _openai_client, _client_loop = _openai_client, None, None
+    if client is not None:
+        await client.close()
@@ -12,6 +12,8 @@ class OperatorAgent(BaseAgent):
     als nächstes aktiv wird basierend auf dem aktuellen SessionState.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         """Initialize Operator Agent."""
         super().__init__("operator")
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-import inspect
 import logging
 import os
 from typing import Optional
 
+from agents.base import pydantic_run_params
 from models.rendering import (
     JacketPatch,
     NeckwearPatch,
@@ -71,8 +71,7 @@ class RenderPatchAgent:
         system_prompt = self._build_system_prompt(params, rag_style_context)
         try:
             base_kwargs = {"deps": {"system_prompt": system_prompt}}
-            run_sig = inspect.signature(self.pydantic_agent.run)
-            allowed_params = set(run_sig.parameters.keys())
+            allowed_params = pydantic_run_params(self.pydantic_agent)
             run_kwargs = {
                 key: value for key, value in base_kwargs.items() if key in allowed_params
             }
@@ -1,7 +1,6 @@
 """Supervisor agent responsible for all routing decisions."""
 from __future__ import annotations
 
-import inspect
 import json
 import logging
 import os
@@ -10,17 +9,89 @@ from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
+from agents.base import keyword_re, pydantic_run_params
 from backend.agents.operator_phase_assessor import PhaseAssessment, PhaseAssessor
 from models.customer import SessionState
 
 logger = logging.getLogger(__name__)
 
+try:  # Optional dependency: C-level JSON parser for decision payloads
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
 try:  # Optional dependency: allow offline rule-based fallback
     from pydantic_ai import Agent as PydanticAgent  # type: ignore
 except ModuleNotFoundError:  # pragma: no cover - exercised via offline path
     PydanticAgent = None
 
 
+# _pre_route keyword tables, matched as substrings of the lowercased message
+_SELECTION_RE = keyword_re([
+    "rechtes foto", "rechte", "rechter", "linkes foto", "rechts", "links",
+    "zweite", "erste", "dritte", "dritter", "dritten", "foto",
+    "nummer", "nr.", "nr ", "no.", "number",
+    "den ersten", "den zweiten", "die erste", "die zweite",
+    "stoff 1", "stoff 2", "stoff 3", "#1", "#2", "#3", "3.",
+    "ein passt", "eins", "zwei", "drei"  # "wenn die nr. ein passt"
+])
+_DESIGN_RE = keyword_re([
+    "revers",
+    "stegrevers",
+    "spitzrevers",
+    "schalkragen",
+    "schulter",
+    "polster",
+    "bundfalte",
+    "futter",
+])
+_REJECTION_RE = keyword_re(["ne", "nein", "nicht", "lieber", "besser", "anders", "andere", "stattdessen"])
+_COLOR_RE = keyword_re([
+    "rot", "blau", "grün", "grau", "schwarz", "braun", "beige", "weiß",
+    "red", "blue", "green", "grey", "gray", "black", "brown", "beige", "white",
+    "dunkel", "hell", "light", "dark", "marine", "navy", "olive"
+])
+_FABRIC_INTENT_RE = keyword_re([
+    "stoff",
+    "stoffe",
+    "fabric",
+    "muster",
+    "farbe",
+    "farben",
+    "bild",
+    "bilder",
+    "foto",
+    "image",
+    "picture",
+])
+_PRICING_RE = keyword_re(["preis", "kosten", "teuer", "günstig", "price", "cost"])
+_COMPARISON_RE = keyword_re(["vergleich", "unterschied", "vs", "gegenüber", "compare"])
+# FIX: More specific measurement keywords to avoid false matches ("messen" = trade fair)
+_MEASUREMENT_RE = keyword_re(["körpermaß", "körpermaße", "vermessen", "maße nehmen", "measurement", "body scan"])
+
+# Session-independent part of the supervisor prompt. It is kept ahead of all
+# per-turn lines so every routing call shares the same cacheable prefix.
+_SUPERVISOR_RULES = "\n".join(
+    [
+        "⚠️ CRITICAL: You MUST return ONLY valid JSON. NO explanatory text before or after the JSON object.",
+        "",
+        "REQUIRED JSON STRUCTURE:",
+        "{",
+        '  "next_destination": "henk1",  // MUST be ONE OF: henk1, design_henk, rag_tool, pricing_tool, comparison_tool, laserhenk, clarification, end',
+        '  "reasoning": "Brief explanation of routing decision",',
+        '  "confidence": 0.9  // Float between 0.0 and 1.0',
+        "}",
+        "",
+        "IMPORTANT: next_destination must be a SINGLE value, not multiple values separated by |",
+        "",
+        "Du bist der Supervisor. Entscheide den nächsten Schritt (Agent oder Tool).",
+        "HENK1 Essentials: Anlass, Timing (event_date auch weich) und Stoff-Farbe sind Pflicht. Budget ist optional.",
+        "Tools (rag/pricing/comparison/measurement) dürfen jederzeit, wenn die Intention klar ist.",
+        "Wenn Intention unklar ist → clarification. End nur wenn wirklich fertig.",
+    ]
+)
+
+
 class SupervisorDecision(BaseModel):
     """Structured routing decision returned by the supervisor."""
 
@@ -117,8 +188,7 @@ class SupervisorAgent:
                 "message_history": self._format_history(conversation_history),
                 "deps": {"system_prompt": system_prompt},
             }
-            run_sig = inspect.signature(self.pydantic_agent.run)
-            allowed_params = set(run_sig.parameters.keys())
+            allowed_params = pydantic_run_params(self.pydantic_agent)
 
             run_kwargs = {
                 key: value for key, value in base_kwargs.items() if key in allowed_params
@@ -172,7 +242,7 @@ class SupervisorAgent:
                     "LLM decision parse failure, safe fallback"
                 )
         except Exception as exc:  # pragma: no cover - safety fallback
-            logger.error(f"[SupervisorAgent] LLM routing failed: {exc}", exc_info=True)
+            logger.error("[SupervisorAgent] LLM routing failed: %s", exc, exc_info=True)
             decision = self._fallback_decision(
                 "Unexpected supervisor exception, safe fallback"
             )
@@ -212,28 +282,12 @@ class SupervisorAgent:
                 confidence=0.98,
             )
 
-        selection_keywords = [
-            "rechtes foto", "rechte", "rechter", "linkes foto", "rechts", "links",
-            "zweite", "erste", "dritte", "dritter", "dritten", "foto",
-            "nummer", "nr.", "nr ", "no.", "number",
-            "den ersten", "den zweiten", "die erste", "die zweite",
-            "stoff 1", "stoff 2", "stoff 3", "#1", "#2", "#3", "3.",
-            "ein passt", "eins", "zwei", "drei"  # "wenn die nr. ein passt"
-        ]
-
-        design_keywords = [
-            "revers",
-            "stegrevers",
-            "spitzrevers",
-            "schalkragen",
-            "schulter",
-            "polster",
-            "bundfalte",
-            "futter",
-        ]
-
         # DEBUG: Log fabric selection check
-        logger.info(f"[SupervisorAgent] Checking fabric selection: text='{text}', shown_fabric_images={len(state.shown_fabric_images) if state.shown_fabric_images else 0}")
+        logger.info(
+            "[SupervisorAgent] Checking fabric selection: text='%s', shown_fabric_images=%d",
+            text,
+            len(state.shown_fabric_images) if state.shown_fabric_images else 0,
+        )
 
         fabric_codes = [img.get("fabric_code", "").lower() for img in (state.shown_fabric_images or [])]
 
@@ -246,8 +300,11 @@ class SupervisorAgent:
             None,
         )
 
-        if state.shown_fabric_images and (code_match is not None or any(keyword in text for keyword in selection_keywords)):
-            logger.info(f"[SupervisorAgent] ✅ Fabric selection detected: '{text}' matches keywords/codes, routing to HENK1")
+        if state.shown_fabric_images and (code_match is not None or _SELECTION_RE.search(text)):
+            logger.info(
+                "[SupervisorAgent] ✅ Fabric selection detected: '%s' matches keywords/codes, routing to HENK1",
+                text,
+            )
             return SupervisorDecision(
                 next_destination="henk1",
                 reasoning="Detected fabric selection, routing back to henk1/design flow",
@@ -256,23 +313,19 @@ class SupervisorAgent:
             )
         else:
             if state.shown_fabric_images:
-                logger.info(f"[SupervisorAgent] ❌ No fabric selection keyword found in '{text}'")
+                logger.info("[SupervisorAgent] ❌ No fabric selection keyword found in '%s'", text)
             else:
-                logger.info(f"[SupervisorAgent] ❌ No shown_fabric_images in state (empty or None)")
+                logger.info("[SupervisorAgent] ❌ No shown_fabric_images in state (empty or None)")
 
         # Check for REJECTION + NEW COLOR request (e.g., "ne, bitte grün")
-        rejection_keywords = ["ne", "nein", "nicht", "lieber", "besser", "anders", "andere", "stattdessen"]
-        color_keywords = [
-            "rot", "blau", "grün", "grau", "schwarz", "braun", "beige", "weiß",
-            "red", "blue", "green", "grey", "gray", "black", "brown", "beige", "white",
-            "dunkel", "hell", "light", "dark", "marine", "navy", "olive"
-        ]
-
-        has_rejection = any(keyword in text for keyword in rejection_keywords)
-        has_color = any(keyword in text for keyword in color_keywords)
+        has_rejection = _REJECTION_RE.search(text) is not None
+        has_color = _COLOR_RE.search(text) is not None
 
         if state.shown_fabric_images and has_rejection and has_color:
-            logger.info(f"[SupervisorAgent] ✅ Rejection + new color detected: '{text}', routing to HENK1 for new RAG search")
+            logger.info(
+                "[SupervisorAgent] ✅ Rejection + new color detected: '%s', routing to HENK1 for new RAG search",
+                text,
+            )
             return SupervisorDecision(
                 next_destination="henk1",
                 reasoning="Customer rejected shown fabrics and requested different color, need new fabric search",
@@ -287,7 +340,7 @@ class SupervisorAgent:
             or state.design_preferences.revers_type
         )
 
-        if design_phase_active and any(keyword in text for keyword in design_keywords):
+        if design_phase_active and _DESIGN_RE.search(text):
             logger.info(
                 "[SupervisorAgent] ✅ Design preference detected: '%s' matches design keywords, routing to DESIGN_HENK",
                 text,
@@ -305,28 +358,7 @@ class SupervisorAgent:
         elif state.design_preferences.lining_color:
             color_hint = state.design_preferences.lining_color
 
-        fabric_keywords = [
-            "stoff",
-            "stoffe",
-            "fabric",
-            "muster",
-            "farbe",
-            "farben",
-            "bild",
-            "bilder",
-            "foto",
-            "image",
-            "picture",
-        ]
-        pricing_keywords = ["preis", "kosten", "teuer", "günstig", "price", "cost"]
-        comparison_keywords = ["vergleich", "unterschied", "vs", "gegenüber", "compare"]
-        # FIX: More specific measurement keywords to avoid false matches ("messen" = trade fair)
-        measurement_keywords = ["körpermaß", "körpermaße", "vermessen", "maße nehmen", "measurement", "body scan"]
-
-        def _matches(keywords: list[str]) -> bool:
-            return any(keyword in text for keyword in keywords)
-
-        if _matches(fabric_keywords):
+        if _FABRIC_INTENT_RE.search(text):
             return SupervisorDecision(
                 next_destination="rag_tool",
                 reasoning="Detected fabric/image intent via keywords",
@@ -334,7 +366,7 @@ class SupervisorAgent:
                 confidence=0.92,
             )
 
-        if _matches(pricing_keywords):
+        if _PRICING_RE.search(text):
             return SupervisorDecision(
                 next_destination="pricing_tool",
                 reasoning="Detected pricing intent via keywords",
@@ -342,7 +374,7 @@ class SupervisorAgent:
                 confidence=0.9,
             )
 
-        if _matches(comparison_keywords):
+        if _COMPARISON_RE.search(text):
             return SupervisorDecision(
                 next_destination="comparison_tool",
                 reasoning="Detected comparison intent via keywords",
@@ -350,7 +382,7 @@ class SupervisorAgent:
                 confidence=0.9,
             )
 
-        if _matches(measurement_keywords):
+        if _MEASUREMENT_RE.search(text):
             return SupervisorDecision(
                 next_destination="laserhenk",
                 reasoning="Detected measurement intent via keywords",
@@ -373,23 +405,9 @@ class SupervisorAgent:
     def _build_supervisor_prompt(self, state: SessionState, assessment: PhaseAssessment) -> str:
         customer_data = state.customer.model_dump()
         dynamic_context = [
-            "⚠️ CRITICAL: You MUST return ONLY valid JSON. NO explanatory text before or after the JSON object.",
-            "",
-            "REQUIRED JSON STRUCTURE:",
-            "{",
-            '  "next_destination": "henk1",  // MUST be ONE OF: henk1, design_henk, rag_tool, pricing_tool, comparison_tool, laserhenk, clarification, end',
-            '  "reasoning": "Brief explanation of routing decision",',
-            '  "confidence": 0.9  // Float between 0.0 and 1.0',
-            "}",
-            "",
-            "IMPORTANT: next_destination must be a SINGLE value, not multiple values separated by |",
-            "",
-            "Du bist der Supervisor. Entscheide den nächsten Schritt (Agent oder Tool).",
-            "HENK1 Essentials: Anlass, Timing (event_date auch weich) und Stoff-Farbe sind Pflicht. Budget ist optional.",
+            _SUPERVISOR_RULES,
             f"Missing fields laut Assessment: {', '.join(assessment.missing_fields) or 'keine'}",
             f"Recommended phase: {assessment.recommended_phase}",
-            "Tools (rag/pricing/comparison/measurement) dürfen jederzeit, wenn die Intention klar ist.",
-            "Wenn Intention unklar ist → clarification. End nur wenn wirklich fertig.",
         ]
 
         optional_fields = [f"{k}={v}" for k, v in customer_data.items() if v]
@@ -515,7 +533,8 @@ class SupervisorAgent:
                 return self._fallback_decision("Empty decision payload from supervisor LLM")
 
             try:
-                parsed = json.loads(raw)
+                # orjson.JSONDecodeError subclasses json.JSONDecodeError
+                parsed = orjson.loads(raw) if orjson is not None else json.loads(raw)
             except json.JSONDecodeError as exc:
                 snippet = raw[:160]
                 logger.warning(
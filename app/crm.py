@@ -10,6 +10,7 @@ from flask_jwt_extended import jwt_required
 from pydantic import BaseModel, Field
 
 from app.middleware import get_current_user_id, beta_user_required
+from tools.crm_tool import get_pipedrive_session
 
 crm_bp = Blueprint('crm', __name__)
 
@@ -52,7 +53,7 @@ class PipedriveClient:
         params = kwargs.get('params', {})
         params['api_token'] = self.api_key
 
-        response = requests.request(
+        response = get_pipedrive_session().request(
             method=method,
             url=url,
             params=params,
@@ -4,6 +4,7 @@ import argparse
 import asyncio
 from typing import Optional, Sequence
 
+from agents.openai_client import close_openai_client
 from workflow.graph_state import create_initial_state
 from workflow.workflow import create_smart_workflow
 
@@ -45,7 +46,11 @@ async def run_agent_system(session_id: str, user_message: str = "Hallo HENK!"):
 
     workflow = create_smart_workflow()
 
-    final_state = await workflow.ainvoke(state)
+    try:
+        final_state = await workflow.ainvoke(state)
+    finally:
+        # asyncio.run closes the loop next; release the pooled connections first
+        await close_openai_client()
 
     print("🧭 Workflow finished. Messages exchanged:")
     for msg in final_state.get("messages", []):
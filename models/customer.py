@@ -2,14 +2,18 @@
 
 from datetime import datetime
 from enum import Enum
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 if TYPE_CHECKING:
     pass
 
 
+# Lead id HENK1 records before mood-board approval; not a secured CRM lead
+PROVISIONAL_LEAD_PREFIX = "HENK1_LEAD_"
+
+
 class CustomerType(str, Enum):
     """Customer type classification."""
 
@@ -35,6 +39,17 @@ class Customer(BaseModel):
         None, description="Structured appointment data (location, date_preference, etc.)"
     )
 
+    @property
+    def has_crm_lead(self) -> bool:
+        """
+        Whether a CRM lead counts as secured for the design/appointment flow.
+
+        Real, pending and MOCK leads count; only the provisional lead HENK1
+        records before mood-board approval does not.
+        """
+        lead_id = self.crm_lead_id
+        return bool(lead_id) and not lead_id.startswith(PROVISIONAL_LEAD_PREFIX)
+
 
 class Measurements(BaseModel):
     """Customer measurements from SAIA or manual input."""
@@ -104,6 +119,11 @@ class DesignPreferences(BaseModel):
         None, description="User's preferred fabric colors for garments (suits, shirts, etc.)"
     )
 
+    @property
+    def preferences_complete(self) -> bool:
+        """Whether the minimum design details for a mood board are known."""
+        return self.revers_type is not None and self.shoulder_padding is not None
+
 
 class FabricSelectionState(BaseModel):
     """Consolidated fabric selection and RAG state."""
@@ -122,6 +142,26 @@ class FabricSelectionState(BaseModel):
     )
     rag_context: Optional[dict] = Field(None, description="Context from RAG database")
 
+    # fabric_code → shown fabric, built lazily by find_shown_fabric. Callers
+    # append to shown_fabric_images directly, so the index catches up on new
+    # entries and is rebuilt if the list is replaced or shrinks.
+    _shown_fabric_index: dict[str, dict] = PrivateAttr(default_factory=dict)
+    _shown_fabric_indexed: tuple[Optional[list], int] = PrivateAttr(default=(None, 0))
+
+    def find_shown_fabric(self, fabric_code: Optional[str]) -> Optional[dict]:
+        """Return the first shown fabric with ``fabric_code``, or None."""
+        images = self.shown_fabric_images
+        indexed_list, indexed = self._shown_fabric_indexed
+        if indexed_list is not images or indexed > len(images):
+            self._shown_fabric_index = {}
+            indexed = 0
+        if indexed < len(images):
+            index = self._shown_fabric_index
+            for fabric in images[indexed:]:
+                index.setdefault(fabric.get("fabric_code"), fabric)
+        self._shown_fabric_indexed = (images, len(images))
+        return self._shown_fabric_index.get(fabric_code)
+
 
 class ImageGenerationState(BaseModel):
     """Consolidated image generation state."""
@@ -147,6 +187,10 @@ class ImageGenerationState(BaseModel):
         None, description="User feedback for mood board iteration"
     )
 
+    # DesignHenk's fabric data for DALLE, keyed on the identity of the source
+    # fabric dict: (source, SelectedFabricData, model_dump(exclude_none=True)).
+    _fabric_data_cache: Optional[tuple[Optional[dict], Any, dict]] = PrivateAttr(default=None)
+
 
 class AgentProgressState(BaseModel):
     """Consolidated agent progress tracking flags."""
@@ -208,7 +252,10 @@ class SessionState(BaseModel):
     # Conversation and routing
     conversation_history: list[dict] = Field(
         default_factory=list,
-        description="Message history as list of dicts with role/content/sender",
+        description=(
+            "Message history as list of dicts with role/content/sender; "
+            "entries are normalized to dicts on write (see workflow.nodes_kiss._serialize_message)"
+        ),
     )
     current_agent: Optional[str] = Field(None, description="Current active agent")
     next_action: Optional[str] = None
@@ -56,30 +56,23 @@ class PatchDecision(BaseModel):
     clarification_questions: list[str] = Field(default_factory=list)
 
 
+# DesignPreferencesPatch fields that map 1:1 onto DesignPreferences
+_PATCHABLE_FIELDS = frozenset(DesignPreferencesPatch.model_fields) & frozenset(
+    DesignPreferences.model_fields
+)
+
+
 def apply_design_preferences_patch(
     existing: DesignPreferences, patch: DesignPreferencesPatch
 ) -> DesignPreferences:
-    """Apply design patch to DesignPreferences, ignoring unknown values."""
-    updated = existing.model_copy(deep=True)
-
-    def _set(attr: str, value):
-        if value is None:
-            return
-        if isinstance(value, str) and value == "unknown":
-            return
-        setattr(updated, attr, value)
-
-    _set("jacket_front", patch.jacket_front)
-    _set("button_count", patch.button_count)
-    _set("wants_vest", patch.wants_vest)
-    _set("lapel_style", patch.lapel_style)
-    _set("lapel_roll", patch.lapel_roll)
-    _set("shoulder_padding", patch.shoulder_padding)
-    _set("trouser_front", patch.trouser_front)
-    _set("trouser_color", patch.trouser_color)
-    _set("neckwear", patch.neckwear)
-    _set("notes_normalized", patch.notes_normalized)
-    _set("preferred_material", patch.preferred_material)
-    _set("requested_fabric_code", patch.requested_fabric_code)
-
-    return updated
+    """
+    Apply design patch to DesignPreferences, ignoring unknown values.
+
+    Returns a shallow copy; patched fields are added to ``model_fields_set``.
+    """
+    updates = {
+        attr: value
+        for attr, value in patch
+        if value is not None and value != "unknown" and attr in _PATCHABLE_FIELDS
+    }
+    return existing.model_copy(update=updates)
@@ -0,0 +1,185 @@
+"""Tests for the BaseAgent helpers."""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agents.base import AgentDecision, BaseAgent, LRUCache, keyword_re, normalize_phrase
+from models.customer import Customer, SessionState
+
+
+class _EchoAgent(BaseAgent):
+    def __init__(self):
+        super().__init__("echo")
+
+    async def process(self, state: SessionState) -> AgentDecision:
+        return AgentDecision(message=state.session_id, should_continue=False)
+
+
+def _state(**kwargs) -> SessionState:
+    return SessionState(session_id="s-1", customer=Customer(), **kwargs)
+
+
+def test_update_state_sets_fields_and_current_agent():
+    state = _state()
+
+    updated = _EchoAgent()._update_state(state, next_action="collect_preferences")
+
+    assert updated is not state
+    assert updated.next_action == "collect_preferences"
+    assert updated.current_agent == "echo"
+    assert state.current_agent is None
+
+
+def test_update_state_reuses_nested_models():
+    state = _state()
+
+    updated = _EchoAgent()._update_state(state, next_action="x")
+
+    assert updated.design_preferences is state.design_preferences
+    assert updated.customer is state.customer
+
+
+def test_update_state_validates_update_values():
+    state = _state()
+
+    updated = _EchoAgent()._update_state(state, customer={"name": "Anna"})
+
+    assert isinstance(updated.customer, Customer)
+    assert updated.customer.name == "Anna"
+    with pytest.raises(ValueError):
+        _EchoAgent()._update_state(state, customer="not a customer")
+
+
+def test_agent_decision_is_immutable_and_serializable():
+    decision = AgentDecision(action="dalle_tool", action_params={"session_id": "s-1"})
+
+    try:
+        decision.action = "other"
+    except AttributeError:
+        pass
+    else:  # pragma: no cover - guard
+        raise AssertionError("AgentDecision must be frozen")
+
+    assert decision.to_dict() == {
+        "next_agent": None,
+        "message": None,
+        "action": "dalle_tool",
+        "action_params": {"session_id": "s-1"},
+        "should_continue": True,
+    }
+    assert AgentDecision.model_validate(decision.to_dict()) == decision
+
+
+def test_agent_decision_to_bytes_round_trips_through_json():
+    decision = AgentDecision(
+        next_agent="design_henk", action_params={"fabric": "Schurwolle"}
+    )
+
+    assert json.loads(decision.to_bytes()) == decision.to_dict()
+
+
+def test_update_state_rejects_unknown_fields():
+    state = _state()
+
+    with pytest.raises(ValueError):
+        _EchoAgent()._update_state(state, not_a_field=True)
+
+
+async def test_call_llm_respects_class_concurrency_limit():
+    class _LimitedAgent(_EchoAgent):
+        pass
+
+    _LimitedAgent.configure_concurrency(2)
+    agent = _LimitedAgent()
+    running = 0
+    peak = 0
+
+    async def fake_llm_call():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return "ok"
+
+    results = await asyncio.gather(*(agent._call_llm(fake_llm_call()) for _ in range(6)))
+
+    assert results == ["ok"] * 6
+    assert peak == 2
+    assert _EchoAgent._get_llm_semaphore() is not _LimitedAgent._get_llm_semaphore()
+
+
+def test_update_state_without_changes_returns_same_state():
+    state = _state(current_agent="echo")
+
+    assert _EchoAgent()._update_state(state) is state
+    assert _EchoAgent()._update_state(_state()).current_agent == "echo"
+
+
+def test_agent_decision_action_params_are_read_only_views():
+    params = {"session_id": "s-1"}
+    decision = AgentDecision(action="crm_create_lead", action_params=params)
+
+    with pytest.raises(TypeError):
+        decision.action_params["session_id"] = "other"
+
+    assert decision.action_params["session_id"] == "s-1"
+    assert type(decision.to_dict()["action_params"]) is dict
+
+
+def test_session_state_schema_is_built_at_import():
+    # A lazily built SessionState would pay its schema build inside the first
+    # user request of every worker process.
+    assert SessionState.__pydantic_complete__
+    assert not SessionState.model_config.get("defer_build", False)
+
+
+async def test_base_agent_process_must_be_overridden():
+    with pytest.raises(NotImplementedError):
+        await BaseAgent("bare").process(_state())
+
+
+def test_pydantic_run_params_are_inspected_once_per_implementation():
+    from agents.base import _signature_params, pydantic_run_params
+
+    class _Agent:
+        async def run(self, user_prompt, *, deps=None, message_history=None):
+            return None
+
+    _signature_params.cache_clear()
+
+    assert pydantic_run_params(_Agent()) == {"self", "user_prompt", "deps", "message_history"}
+    pydantic_run_params(_Agent())
+    assert _signature_params.cache_info().hits == 1
+
+
+def test_keyword_re_finds_overlapping_keywords():
+    pattern = keyword_re(["meeting", "gala", "a.b"])
+
+    assert pattern.findall("meetingala") == ["meeting", "gala"]
+    assert pattern.search("axb") is None
+
+
+def test_lru_cache_evicts_least_recently_used_entry():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert list(cache.values()) == [1, 3]
+    assert cache.get("b", "missing") == "missing"
+
+
+def test_normalize_phrase_keeps_punctuation():
+    assert normalize_phrase("  Spitzrevers   BITTE ") == "spitzrevers bitte"
+    assert normalize_phrase("Spitzrevers?") != normalize_phrase("Spitzrevers!")
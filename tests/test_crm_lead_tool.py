@@ -0,0 +1,79 @@
+"""Tests für das CRM-Lead-Tool im KISS-Workflow."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import tools.image_storage as image_storage
+from models.customer import Customer, SessionState
+from models.tools import CRMLeadResponse
+from tools.crm_tool import CRMTool
+from workflow.nodes_kiss import _crm_create_lead
+
+
+async def test_crm_lead_and_mood_image_archive_run_concurrently(monkeypatch):
+    archive_started = asyncio.Event()
+
+    async def create_lead(self, lead_data):
+        # Only completes if the archive runs at the same time
+        await asyncio.wait_for(archive_started.wait(), timeout=1)
+        return CRMLeadResponse(lead_id="L-1", success=True)
+
+    class _Storage:
+        async def archive_to_session_docs(self, session_id, image_url):
+            archive_started.set()
+            return f"docs/{session_id}/approved.png"
+
+    monkeypatch.setattr(CRMTool, "create_lead", create_lead)
+    monkeypatch.setattr(image_storage, "get_storage_manager", lambda: _Storage())
+    state = {"session_state": SessionState(session_id="s-1", customer=Customer())}
+
+    result = await _crm_create_lead(
+        {
+            "customer_email": "kunde@example.com",
+            "mood_image_url": "https://example.com/mood.png",
+            "archive_mood_image": True,
+        },
+        state,
+    )
+
+    assert result.metadata["crm_lead_id"] == "L-1"
+    assert state["session_state"].customer.crm_lead_id == "L-1"
+
+
+async def test_failed_lead_falls_back_to_mock_id_with_dev_hint(monkeypatch):
+    async def create_lead(self, lead_data):
+        return CRMLeadResponse(lead_id="", success=False, message="not configured")
+
+    monkeypatch.setattr(CRMTool, "create_lead", create_lead)
+    session_state = SessionState(session_id="session-42", customer=Customer())
+    state = {"session_state": session_state}
+
+    result = await _crm_create_lead(
+        {"customer_email": "kunde@example.com", "session_id": "other-id"}, state
+    )
+
+    assert session_state.customer.crm_lead_id == "MOCK_CRM_session-"
+    assert result.metadata == {
+        "crm_lead_id": "MOCK_CRM_session-",
+        "mock": True,
+        "error": "not configured",
+    }
+    assert "PIPEDRIVE_API_KEY" in result.text
+
+
+def test_pipedrive_clients_reuse_one_pooled_session():
+    from tools.crm_tool import get_pipedrive_session
+
+    assert get_pipedrive_session() is get_pipedrive_session()
+    assert get_pipedrive_session().get_adapter("https://x.pipedrive.com")._pool_maxsize == 100
+
+
+def test_only_provisional_henk1_leads_do_not_count_as_crm_lead():
+    assert not Customer().has_crm_lead
+    assert not Customer(crm_lead_id="HENK1_LEAD_abc").has_crm_lead
+    for lead_id in ("4711", "MOCK_CRM_abc"):
+        assert Customer(crm_lead_id=lead_id).has_crm_lead
@@ -0,0 +1,46 @@
+"""Tests for fabric image loading during mood board generation."""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import tools.dalle_tool as dalle_tool
+from models.tools import DALLEImageResponse
+from tools.dalle_tool import DALLETool
+
+
+async def test_fabric_images_load_while_dalle_generates(monkeypatch):
+    monkeypatch.setattr(dalle_tool, "Image", object())
+    loading = threading.Event()
+    loaded = []
+
+    def load_fabric_image(self, fabric):
+        loading.set()
+        loaded.append(fabric["fabric_code"])
+        return None
+
+    async def generate_image(self, request, decision=None):
+        # Only finds the event set if the fabric load runs concurrently
+        assert await asyncio.to_thread(loading.wait, 1)
+        return DALLEImageResponse(image_url=None, success=False, error="stub")
+
+    monkeypatch.setattr(DALLETool, "_load_fabric_image", load_fabric_image)
+    monkeypatch.setattr(DALLETool, "generate_image", generate_image)
+    fabrics = [
+        {"fabric_code": "A1", "image_urls": ["/fabrics/images/A1.jpg"]},
+        {"fabric_code": "B2", "image_urls": ["/fabrics/images/B2.jpg"]},
+        {"fabric_code": "C3", "image_urls": ["/fabrics/images/C3.jpg"]},
+    ]
+
+    response = await DALLETool(api_key="sk-test").generate_mood_board_with_fabrics(
+        fabrics,
+        occasion="Hochzeit",
+        design_preferences={"revers_type": "Spitzrevers"},
+    )
+
+    assert response.success is False
+    assert sorted(loaded) == ["A1", "B2"]
@@ -0,0 +1,359 @@
+"""Tests for DesignHenkAgent helpers."""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import agents.design_henk as design_henk
+import agents.openai_client as openai_client
+from agents.base import LRUCache
+from agents.design_henk import DesignHenkAgent
+from models.customer import Customer, SessionState
+
+
+def test_agents_share_one_openai_client(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(openai_client, "_openai_client", None)
+
+    first = DesignHenkAgent()
+    second = DesignHenkAgent()
+
+    assert first.client is not None
+    assert first.client is second.client
+
+
+def test_openai_client_is_recreated_for_a_new_event_loop(monkeypatch):
+    import asyncio
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(openai_client, "_openai_client", None)
+    monkeypatch.setattr(openai_client, "_client_loop", None)
+
+    async def get_client():
+        return openai_client.get_openai_client()
+
+    first = asyncio.run(get_client())
+    second = asyncio.run(get_client())
+
+    assert first is not second
+
+    async def close_and_get():
+        client = openai_client.get_openai_client()
+        await openai_client.close_openai_client()
+        return client, openai_client.get_openai_client()
+
+    closed, fresh = asyncio.run(close_and_get())
+    assert closed.is_closed()
+    assert fresh is not closed
+
+
+def test_henk1_uses_the_shared_openai_client(monkeypatch):
+    from agents.henk1 import Henk1Agent
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(openai_client, "_openai_client", None)
+
+    assert Henk1Agent().client is DesignHenkAgent().client is not None
+
+
+async def test_feedback_keywords_without_client_are_empty(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr(openai_client, "_openai_client", None)
+
+    agent = DesignHenkAgent()
+
+    assert agent.client is None
+    assert await agent._extract_style_keywords_from_feedback("modern, leicht") == []
+
+
+def test_style_knowledge_follows_the_agents_catalog():
+    def catalog(name):
+        return {"dress_codes": {"formal_evening": {"name": name}}}
+
+    first, second = DesignHenkAgent(), DesignHenkAgent()
+    first.style_catalog = catalog("Black Tie")
+    second.style_catalog = catalog("White Tie")
+
+    assert "Black Tie" in first._get_style_knowledge("Gala")
+    assert "White Tie" in second._get_style_knowledge("Gala")
+
+
+def test_system_prompt_is_static_and_context_carries_session_data():
+    agent = DesignHenkAgent()
+    state = SessionState(session_id="s-1", customer=Customer())
+    state.image_state.mood_board_iteration_count = 3
+
+    context = agent._get_context_prompt(state)
+
+    assert agent._get_system_prompt() == DesignHenkAgent()._get_system_prompt()
+    assert "Moodbild-Iteration: 3/7" in context
+    assert "Moodbild-Iteration" not in agent._get_system_prompt()
+
+
+class _FakeCompletions:
+    def __init__(self, content: str):
+        self.content = content
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(content=self.content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _fake_client(content: str) -> SimpleNamespace:
+    return SimpleNamespace(chat=SimpleNamespace(completions=_FakeCompletions(content)))
+
+
+async def test_feedback_keywords_are_cached_per_normalized_phrase(monkeypatch):
+    monkeypatch.setattr(design_henk, "_feedback_keyword_cache", LRUCache(512))
+    agent = DesignHenkAgent()
+    agent.client = _fake_client('{"keywords": ["modern", "italian"]}')
+
+    first = await agent._extract_style_keywords_from_feedback("Modern, italienisch")
+    second = await agent._extract_style_keywords_from_feedback("modern,  ITALIENISCH")
+
+    assert first == second == ["modern", "italian"]
+    assert agent.client.chat.completions.calls == 1
+
+
+def test_patch_agent_is_shared(monkeypatch):
+    monkeypatch.setattr(design_henk, "_patch_agent", None)
+
+    assert design_henk._get_patch_agent() is design_henk._get_patch_agent()
+
+
+def test_style_keywords_from_payload_and_revers():
+    state = SessionState(session_id="s-1", customer=Customer())
+    state.henk1_to_design_payload = {"style": "elegant", "occasion": "Hochzeit"}
+    state.design_preferences.revers_type = "Spitzrevers"
+
+    assert DesignHenkAgent()._extract_style_keywords(state) == [
+        "elegant",
+        "Hochzeit",
+        "klassisch",
+    ]
+
+    state.design_preferences.revers_type = "Schalkragen"
+    assert DesignHenkAgent()._extract_style_keywords(state)[-1] == "modern"
+
+
+def test_style_catalog_is_shared_between_agents():
+    assert DesignHenkAgent().style_catalog is DesignHenkAgent().style_catalog
+
+
+def test_fabric_data_is_cached_until_the_fabric_changes():
+    agent = DesignHenkAgent()
+    state = SessionState(session_id="s-1", customer=Customer())
+    state.favorite_fabric = {"fabric_code": "A1", "color": "navy", "url": "a1.png"}
+
+    first = agent._extract_fabric_data(state)
+    params = agent._fabric_data_params(state)
+
+    assert agent._extract_fabric_data(state) is first
+    assert params == {"fabric_code": "A1", "color": "navy", "image_url": "a1.png"}
+
+    state.favorite_fabric = {"fabric_code": "B2"}
+
+    assert agent._extract_fabric_data(state).fabric_code == "B2"
+
+
+async def test_trivial_feedback_skips_llm(monkeypatch):
+    monkeypatch.setattr(design_henk, "_feedback_keyword_cache", LRUCache(512))
+    agent = DesignHenkAgent()
+    agent.client = _fake_client('{"keywords": ["modern"]}')
+
+    for feedback in ("Ja!", "gefällt mir", "👍", "ok", "?!"):
+        assert await agent._extract_style_keywords_from_feedback(feedback) == []
+
+    assert agent.client.chat.completions.calls == 0
+
+
+def test_llm_messages_keep_dynamic_context_behind_history():
+    agent = DesignHenkAgent()
+    state = SessionState(session_id="s-1", customer=Customer())
+    state.conversation_history = [
+        {"role": "user", "sender": "user", "content": "Hallo"},
+        {"role": "assistant", "sender": "design_henk", "content": "Willkommen"},
+        {"role": "user", "sender": "user", "content": "Etwas leichter bitte"},
+    ]
+
+    messages = agent._build_llm_messages(state, "Moodbild erstellt")
+
+    assert messages[0] == {"role": "system", "content": agent._get_system_prompt()}
+    assert [m["content"] for m in messages[1:3]] == ["Hallo", "Willkommen"]
+    assert messages[-2] == {"role": "system", "content": "CONTEXT: Moodbild erstellt"}
+    assert messages[-3]["role"] == "system"
+    assert messages[-1] == {"role": "user", "content": "Etwas leichter bitte"}
+
+
+def test_dress_code_text_is_rendered_once_per_catalog(monkeypatch):
+    catalog = {
+        "dress_codes": {
+            "business_formal": {
+                "name": "Business",
+                "required_items": ["Krawatte"],
+                "occasions": ["Meeting", "Büro"],
+            }
+        }
+    }
+    agent = DesignHenkAgent()
+    agent.style_catalog = catalog
+
+    blocks = design_henk._dress_code_blocks(catalog)
+
+    assert design_henk._dress_code_blocks(catalog) is blocks
+    assert design_henk._dress_code_text[2] is None
+    assert agent._get_style_knowledge("Business-Termin") == (
+        "\n📋 EMPFEHLUNG FÜR BUSINESS-TERMIN:\n" + blocks["business_formal"]
+    )
+    overview = agent._get_style_knowledge("Freizeit")
+    assert "Anlässe: Meeting, Büro" in overview
+    assert design_henk._dress_code_overview(catalog) is overview
+
+
+def test_llm_messages_add_latest_user_input_only_once():
+    agent = DesignHenkAgent()
+    state = SessionState(session_id="s-1", customer=Customer())
+    state.conversation_history = [
+        {"role": "user", "sender": "user", "content": "Zweireiher"},
+    ] + [
+        {"role": "assistant", "sender": "design_henk", "content": f"Antwort {i}"}
+        for i in range(20)
+    ]
+
+    older = agent._build_llm_messages(state)
+    state.conversation_history.append(
+        {"role": "user", "sender": "user", "content": "Zweireiher"}
+    )
+    recent = agent._build_llm_messages(state)
+
+    assert older[-1] == {"role": "user", "content": "Zweireiher"}
+    assert [m["content"] for m in recent].count("Zweireiher") == 1
+
+
+async def test_reply_cache_reuses_canned_turns_when_enabled(monkeypatch):
+    monkeypatch.setenv("DESIGN_HENK_REPLY_CACHE", "true")
+    monkeypatch.setattr(design_henk, "_reply_cache", LRUCache(256))
+    agent = DesignHenkAgent()
+    agent.client = _fake_client("Welchen Revers-Stil bevorzugst du?")
+
+    replies = []
+    for text in ("Hallo!", "hallo!", "Ich möchte Spitzrevers"):
+        state = SessionState(session_id="s-1", customer=Customer())
+        state.conversation_history = [{"role": "user", "sender": "user", "content": text}]
+        replies.append(await agent._process_with_llm(state, "Frage nach Design."))
+
+    assert replies[0] == replies[1] == replies[2]
+    assert agent.client.chat.completions.calls == 2
+
+    monkeypatch.setenv("DESIGN_HENK_REPLY_CACHE", "false")
+    await agent._process_with_llm(state, "Frage nach Design.")
+    assert agent.client.chat.completions.calls == 3
+
+
+def test_llm_history_window_keeps_a_stable_prefix():
+    agent = DesignHenkAgent()
+    state = SessionState(session_id="s-1", customer=Customer())
+    state.conversation_history = [
+        {"role": "user", "sender": "user", "content": f"Nachricht {i}"}
+        for i in range(12)
+    ]
+
+    before = agent._build_llm_messages(state)
+    state.conversation_history.append(
+        {"role": "user", "sender": "user", "content": "Nachricht 12"}
+    )
+    after = agent._build_llm_messages(state)
+
+    history_before = [m for m in before if m["role"] == "user"]
+    assert history_before[0]["content"] == "Nachricht 0"
+    # System prompt plus every history message before the per-turn context
+    prefix = len(history_before)
+    assert after[:prefix] == before[:prefix]
+
+
+async def test_feedback_without_changes_does_not_spend_an_iteration(monkeypatch):
+    from models.patches import DesignPreferencesPatch, PatchDecision
+
+    decisions = [
+        PatchDecision(confidence=0.2),
+        PatchDecision(
+            confidence=0.9, patch=DesignPreferencesPatch(jacket_front="double_breasted")
+        ),
+    ]
+
+    class _PatchAgent:
+        async def extract_patch_decision(self, user_message, context=None):
+            return decisions.pop(0)
+
+    monkeypatch.setattr(design_henk, "_patch_agent", _PatchAgent())
+    agent = DesignHenkAgent()
+    agent.client = None
+    state = SessionState(session_id="s-1", customer=Customer())
+    state.design_preferences.revers_type = "Spitzrevers"
+    state.design_preferences.shoulder_padding = "mittel"
+    state.mood_image_url = "mood-1.png"
+    state.image_state.mood_board_iteration_count = 2
+    state.image_state.mood_board_feedback = "hmm, weiß nicht"
+
+    decision = await agent.process(state)
+
+    assert decision.action is None
+    assert decision.message == design_henk._CLARIFY_FEEDBACK_MESSAGE
+    assert state.image_state.mood_board_iteration_count == 2
+    assert state.image_state.mood_board_feedback is None
+
+    state.image_state.mood_board_feedback = "lieber Zweireiher"
+    decision = await agent.process(state)
+
+    assert decision.action == "dalle_tool"
+    assert decision.action_params["design_preferences"]["jacket_front"] == "double_breasted"
+    assert state.image_state.mood_board_iteration_count == 3
+
+
+async def test_explicit_regenerate_request_renders_again(monkeypatch):
+    from models.patches import PatchDecision
+
+    class _PatchAgent:
+        async def extract_patch_decision(self, user_message, context=None):
+            return PatchDecision(confidence=0.2)
+
+    monkeypatch.setattr(design_henk, "_patch_agent", _PatchAgent())
+    agent = DesignHenkAgent()
+    agent.client = None
+    state = SessionState(session_id="s-1", customer=Customer())
+    state.design_preferences.revers_type = "Spitzrevers"
+    state.design_preferences.shoulder_padding = "mittel"
+    state.mood_image_url = "mood-1.png"
+    state.image_state.mood_board_iteration_count = 1
+    state.image_state.mood_board_feedback = "Bitte ein neues Bild"
+
+    decision = await agent.process(state)
+
+    assert decision.action == "dalle_tool"
+    assert decision.action_params["regenerate"] is True
+    assert state.image_state.mood_board_iteration_count == 2
+
+
+def test_rag_fabric_image_falls_back_to_local_path():
+    agent = DesignHenkAgent()
+    state = SessionState(session_id="s-1", customer=Customer())
+    state.rag_context = {"fabrics": [{"fabric_code": "R1", "local_image_paths": ["r1.jpg"]}]}
+
+    assert agent._extract_fabric_data(state).image_url == "r1.jpg"
+
+
+def test_style_knowledge_matches_overlapping_occasion_keywords(monkeypatch):
+    agent = DesignHenkAgent()
+    agent.style_catalog = {
+        "dress_codes": {
+            "formal_evening": {"name": "Black Tie"},
+            "business_casual": {"name": "Business Casual"},
+        }
+    }
+
+    assert "Black Tie" in agent._get_style_knowledge("meetingala")
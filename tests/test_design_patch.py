@@ -63,3 +63,79 @@ def test_patch_decision_schema():
 
     assert decision.confidence == 0.72
     assert decision.patch.button_count == 2
+
+
+async def test_structured_outputs_share_one_prompt_cache_key(monkeypatch):
+    from types import SimpleNamespace
+
+    from agents.design_patch_agent import DesignPatchAgent
+
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    requests = []
+
+    async def parse(**kwargs):
+        requests.append(kwargs)
+        message = SimpleNamespace(parsed=PatchDecision(confidence=1.0))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    agent = DesignPatchAgent()
+    agent.openai_client = SimpleNamespace(
+        beta=SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(parse=parse)))
+    )
+
+    await agent._extract_via_structured_outputs("ohne Weste")
+    await agent._extract_via_structured_outputs("mit Spitzrevers")
+
+    assert requests[0]["messages"][0] == requests[1]["messages"][0]
+    assert requests[0]["extra_body"] == {"prompt_cache_key": "design_patch"}
+
+
+async def test_confident_decisions_are_cached_per_normalized_feedback(monkeypatch):
+    from types import SimpleNamespace
+
+    import agents.design_patch_agent as design_patch_agent
+    from agents.base import LRUCache
+    from agents.design_patch_agent import DesignPatchAgent
+
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr(design_patch_agent, "_decision_cache", LRUCache(2048))
+    peak = PatchDecision(patch=DesignPreferencesPatch(lapel_style="peak"), confidence=0.95)
+    replies = {
+        "Spitzrevers bitte": peak,
+        "Spitzrevers bitte?": peak,
+        "Stoff 50C4022": PatchDecision(
+            patch=DesignPreferencesPatch(requested_fabric_code="50C4022"), confidence=0.95
+        ),
+        "hmm": PatchDecision(confidence=0.3),
+    }
+    calls = []
+
+    async def parse(**kwargs):
+        message = kwargs["messages"][-1]["content"]
+        calls.append(message)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(parsed=replies[message]))])
+
+    agent = DesignPatchAgent()
+    agent.use_structured_outputs = True
+    agent.openai_client = SimpleNamespace(
+        beta=SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(parse=parse)))
+    )
+
+    first = await agent.extract_patch_decision("Spitzrevers bitte")
+    second = await agent.extract_patch_decision("spitzrevers  BITTE")
+    await agent.extract_patch_decision("Spitzrevers bitte?")
+    await agent.extract_patch_decision("Spitzrevers bitte", context="Revers")
+    for message in ("Stoff 50C4022", "Stoff 50C4022", "hmm", "hmm"):
+        await agent.extract_patch_decision(message)
+
+    assert first == second
+    assert second.patch.lapel_style == "peak"
+    assert calls == [
+        "Spitzrevers bitte",
+        "Spitzrevers bitte?",
+        "Spitzrevers bitte",
+        "Stoff 50C4022",
+        "Stoff 50C4022",
+        "hmm",
+        "hmm",
+    ]
@@ -18,3 +18,14 @@ def test_apply_design_preferences_patch_applies_vest_and_fabric_code():
 
     assert updated.wants_vest is False
     assert updated.requested_fabric_code == "50C4022"
+
+
+def test_apply_design_preferences_patch_marks_only_patched_fields_as_set():
+    existing = DesignPreferences()
+    patch = DesignPreferencesPatch(lapel_style="peak", lapel_roll="unknown")
+
+    updated = apply_design_preferences_patch(existing, patch)
+
+    assert updated.model_fields_set == {"lapel_style"}
+    assert updated.lapel_roll is None
+    assert existing.lapel_style is None
@@ -0,0 +1,49 @@
+"""Tests for the rule-based HENK1 intent fallback."""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agents.henk1_preferences import fallback_intent_analysis
+
+
+def test_fallback_intent_matches_keywords_as_substrings():
+    analysis = fallback_intent_analysis("Kannst du mir Stoffempfehlungen in Grau-Blau zeigen?", [])
+
+    assert analysis.wants_fabrics is True
+    assert analysis.lead_ready is False
+    assert analysis.search_criteria["colors"] == ["Blue", "Grey"]
+    assert analysis.search_criteria["patterns"] == []
+
+
+def test_fallback_intent_fills_missing_criteria_from_history():
+    history = [
+        {"role": "user", "content": "Einfarbig oder Uni wäre gut"},
+        {"role": "assistant", "content": "Gern, eher Blau oder Beige?"},
+        {"role": "user", "content": "Karo mag ich nicht so"},
+        {"role": "assistant", "content": "Verstanden."},
+    ]
+
+    analysis = fallback_intent_analysis("Schwarz bitte, zeig mir die Auswahl", history)
+
+    assert analysis.wants_fabrics is True
+    assert analysis.lead_ready is True
+    assert analysis.search_criteria["colors"] == ["Black", "Blue", "Beige"]
+    assert analysis.search_criteria["patterns"] == ["Solid", "Check"]
+
+
+def test_fallback_intent_scans_each_message_once():
+    from agents import henk1_preferences
+
+    henk1_preferences._color_pattern_labels.cache_clear()
+    history = [{"role": "user", "content": "Blau, gern mit Streifen"}]
+
+    first = fallback_intent_analysis("Zeig mir Stoffe", history)
+    first.search_criteria["colors"].append("Black")
+    second = fallback_intent_analysis("Zeig mir Stoffe", history)
+
+    assert second.search_criteria["colors"] == ["Blue"]
+    assert second.search_criteria["patterns"] == ["Stripes"]
+    assert henk1_preferences._color_pattern_labels.cache_info().hits == 2
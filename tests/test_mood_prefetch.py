@@ -0,0 +1,138 @@
+"""Tests für das spekulative Vorab-Rendern von Moodboard-Varianten."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import workflow.nodes_kiss as nodes_kiss
+from agents.base import LRUCache
+from models.customer import Customer, SessionState
+from models.tools import DALLEImageResponse
+
+
+async def test_predicted_variant_is_served_from_prefetch(monkeypatch):
+    monkeypatch.setenv("ENABLE_MOOD_PREFETCH", "true")
+    monkeypatch.setattr(nodes_kiss, "_MOOD_PREFETCH", {})
+    rendered = []
+
+    async def render(params, fabric_data, design_prefs, *args):
+        rendered.append(design_prefs["shoulder_padding"])
+        return DALLEImageResponse(image_url=f"{design_prefs['shoulder_padding']}.png")
+
+    monkeypatch.setattr(nodes_kiss, "_render_mood_image", render)
+    state = {"session_state": SessionState(session_id="s-1", customer=Customer())}
+
+    def params(shoulder):
+        return {
+            "fabric_data": {"fabric_code": "A1"},
+            "design_preferences": {"shoulder_padding": shoulder},
+            "style_keywords": ["modern"],
+            "session_id": "s-1",
+        }
+
+    first = await nodes_kiss._dalle_tool(params("medium"), state)
+    await asyncio.sleep(0)  # let the prefetch run during "user think time"
+    second = await nodes_kiss._dalle_tool(params("light"), state)
+
+    assert first.metadata["image_url"] == "medium.png"
+    assert second.metadata["image_url"] == "light.png"
+    # medium (live), light (prefetch); medium is not prefetched again, it is cached
+    assert rendered[:2] == ["medium", "light"]
+    assert rendered.count("light") == 1
+    nodes_kiss._cancel_mood_prefetches("s-1")
+
+
+async def test_unchanged_inputs_reuse_the_previous_mood_board(monkeypatch):
+    monkeypatch.setenv("ENABLE_MOOD_PREFETCH", "false")
+    monkeypatch.setattr(nodes_kiss, "_MOOD_IMAGE_CACHE", LRUCache(256))
+    rendered = []
+
+    async def render(params, fabric_data, design_prefs, *args):
+        rendered.append(design_prefs["shoulder_padding"])
+        return DALLEImageResponse(image_url=f"{len(rendered)}.png")
+
+    monkeypatch.setattr(nodes_kiss, "_render_mood_image", render)
+    state = {"session_state": SessionState(session_id="s-2", customer=Customer())}
+
+    def params(shoulder):
+        return {
+            "fabric_data": {"fabric_code": "A1"},
+            "design_preferences": {"shoulder_padding": shoulder},
+            "style_keywords": ["modern"],
+            "session_id": "s-2",
+        }
+
+    first = await nodes_kiss._dalle_tool(params("medium"), state)
+    again = await nodes_kiss._dalle_tool(params("medium"), state)
+    changed = await nodes_kiss._dalle_tool(params("light"), state)
+
+    assert first.metadata["image_url"] == again.metadata["image_url"] == "1.png"
+    assert changed.metadata["image_url"] == "2.png"
+    assert rendered == ["medium", "light"]
+
+    fresh = await nodes_kiss._dalle_tool({**params("light"), "regenerate": True}, state)
+
+    assert fresh.metadata["image_url"] == "3.png"
+    assert rendered == ["medium", "light", "light"]
+
+
+async def test_several_candidate_variants_render_concurrently(monkeypatch):
+    monkeypatch.setenv("ENABLE_MOOD_PREFETCH", "true")
+    monkeypatch.setenv("MOOD_PREFETCH_VARIANTS", "2")
+    monkeypatch.setattr(nodes_kiss, "_MOOD_PREFETCH", {})
+    monkeypatch.setattr(nodes_kiss, "_MOOD_IMAGE_CACHE", LRUCache(256))
+    rendered = []
+
+    async def render(params, fabric_data, design_prefs, *args):
+        rendered.append(design_prefs["shoulder_padding"])
+        return DALLEImageResponse(image_url=f"{design_prefs['shoulder_padding']}.png")
+
+    monkeypatch.setattr(nodes_kiss, "_render_mood_image", render)
+    state = {"session_state": SessionState(session_id="s-3", customer=Customer())}
+
+    def params(shoulder):
+        return {
+            "fabric_data": {"fabric_code": "A1"},
+            "design_preferences": {"shoulder_padding": shoulder},
+            "style_keywords": ["modern"],
+            "session_id": "s-3",
+        }
+
+    await nodes_kiss._dalle_tool(params("medium"), state)
+    await asyncio.sleep(0)
+    stronger = await nodes_kiss._dalle_tool(params("structured"), state)
+
+    assert stronger.metadata["image_url"] == "structured.png"
+    assert sorted(rendered[:3]) == ["light", "medium", "structured"]
+    assert rendered.count("structured") == 1
+    nodes_kiss._cancel_mood_prefetches("s-3")
+
+
+async def test_finished_prefetch_leaves_the_task_registry(monkeypatch):
+    monkeypatch.setenv("ENABLE_MOOD_PREFETCH", "true")
+    monkeypatch.setattr(nodes_kiss, "_MOOD_PREFETCH", {})
+    monkeypatch.setattr(nodes_kiss, "_MOOD_IMAGE_CACHE", LRUCache(256))
+
+    async def render(params, fabric_data, design_prefs, *args):
+        return DALLEImageResponse(image_url=f"{design_prefs['shoulder_padding']}.png")
+
+    monkeypatch.setattr(nodes_kiss, "_render_mood_image", render)
+    state = {"session_state": SessionState(session_id="s-4", customer=Customer())}
+
+    await nodes_kiss._dalle_tool(
+        {
+            "fabric_data": {"fabric_code": "A1"},
+            "design_preferences": {"shoulder_padding": "none"},
+            "session_id": "s-4",
+        },
+        state,
+    )
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+    # The session never asks again: the variant is in the bounded cache, no task is kept
+    assert nodes_kiss._MOOD_PREFETCH == {}
+    assert [r.image_url for r in nodes_kiss._MOOD_IMAGE_CACHE.values()] == ["none.png", "light.png"]
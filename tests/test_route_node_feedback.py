@@ -0,0 +1,34 @@
+"""Tests for RouteNode's keyword-based mood board feedback detection."""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from models.customer import Customer, SessionState
+from workflow.nodes_kiss import route_node
+
+
+def _mood_board_state(message: str) -> dict:
+    session_state = SessionState(session_id="s-1", customer=Customer())
+    session_state.current_agent = "design_henk"
+    session_state.mood_image_url = "https://example.com/mood.png"
+    return {
+        "messages": [{"role": "user", "content": message}],
+        "session_state": session_state,
+    }
+
+
+async def test_mood_board_approval_is_detected():
+    result = await route_node(_mood_board_state("Ja, gefällt mir!"))
+
+    assert result["metadata"] == {"mood_board_approved": True}
+    assert result["session_state"].image_state.mood_board_approved is True
+
+
+async def test_mood_board_change_request_is_stored_as_feedback():
+    result = await route_node(_mood_board_state("Lieber Zweireiher"))
+
+    assert result["metadata"] == {"mood_board_feedback": "Lieber Zweireiher"}
+    assert result["session_state"].image_state.mood_board_feedback == "Lieber Zweireiher"
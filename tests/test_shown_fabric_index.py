@@ -0,0 +1,35 @@
+"""Tests für den fabric_code-Index über shown_fabric_images."""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from models.customer import Customer, SessionState
+
+
+def test_find_shown_fabric_follows_appends_and_keeps_first_match():
+    state = SessionState(session_id="s1", customer=Customer())
+    first = {"fabric_code": "A1", "color": "navy"}
+    state.shown_fabric_images.append(first)
+
+    assert state.fabric_state.find_shown_fabric("A1") is first
+    assert state.fabric_state.find_shown_fabric("B2") is None
+
+    second = {"fabric_code": "B2"}
+    state.shown_fabric_images.extend([second, {"fabric_code": "A1", "color": "grau"}])
+
+    assert state.fabric_state.find_shown_fabric("B2") is second
+    assert state.fabric_state.find_shown_fabric("A1") is first
+
+
+def test_find_shown_fabric_rebuilds_when_list_is_replaced():
+    state = SessionState(session_id="s1", customer=Customer())
+    state.shown_fabric_images.append({"fabric_code": "A1"})
+    assert state.fabric_state.find_shown_fabric("A1") is not None
+
+    state.fabric_state.shown_fabric_images = [{"fabric_code": "C3"}]
+
+    assert state.fabric_state.find_shown_fabric("A1") is None
+    assert state.fabric_state.find_shown_fabric("C3") == {"fabric_code": "C3"}
@@ -81,3 +81,15 @@ def test_pre_route_accepts_fabric_codes_and_positions(message, expected_index):
 
     assert decision is not None
     assert decision.next_destination == "henk1"
+
+
+def test_supervisor_prompt_starts_with_the_static_rules():
+    from agents.supervisor_agent import _SUPERVISOR_RULES
+
+    agent = SupervisorAgent()
+    state = SessionState(session_id="s-1", customer=Customer())
+    assessment = agent.phase_assessor.assess(state)
+
+    prompt = agent._build_supervisor_prompt(state, assessment)
+
+    assert prompt.startswith(_SUPERVISOR_RULES + "\nMissing fields laut Assessment:")
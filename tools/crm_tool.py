@@ -1,9 +1,12 @@
 """CRM Tool - Pipedrive API Integration (NEW)."""
 
+import asyncio
 import os
+import threading
 from typing import Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 from models.tools import (
     CRMAppointmentCreate,
     CRMAppointmentResponse,
@@ -13,6 +16,24 @@ from models.tools import (
 )
 
 
+# One keep-alive pool for every Pipedrive call in the process: a fresh
+# requests.request() per call pays TCP + TLS setup each time.
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_pipedrive_session() -> requests.Session:
+    """Return the shared, connection-pooled HTTP session for Pipedrive."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=100))
+                _session = session
+    return _session
+
+
 class PipedriveClient:
     """Pipedrive API Client."""
 
@@ -44,7 +65,7 @@ class PipedriveClient:
         params = kwargs.get('params', {})
         params['api_token'] = self.api_key
 
-        response = requests.request(
+        response = get_pipedrive_session().request(
             method=method,
             url=url,
             params=params,
@@ -157,11 +178,12 @@ class CRMTool:
 
         try:
             # Check if person exists
-            person = self.client.get_person_by_email(lead_data.email)
+            person = await asyncio.to_thread(self.client.get_person_by_email, lead_data.email)
 
             if not person:
                 # Create new person
-                person = self.client.create_person(
+                person = await asyncio.to_thread(
+                    self.client.create_person,
                     name=lead_data.customer_name,
                     email=lead_data.email,
                     phone=lead_data.phone,
@@ -172,7 +194,8 @@ class CRMTool:
             # Create deal if value provided
             deal_id = None
             if lead_data.deal_value and lead_data.deal_value > 0:
-                deal = self.client.create_deal(
+                deal = await asyncio.to_thread(
+                    self.client.create_deal,
                     title=f"Lead: {lead_data.customer_name}",
                     person_id=person_id,
                     value=lead_data.deal_value,
@@ -213,7 +236,8 @@ class CRMTool:
 
         try:
             # Update person
-            self.client._request(
+            await asyncio.to_thread(
+                self.client._request,
                 'PUT',
                 f'persons/{update_data.lead_id}',
                 json=update_data.updates,
@@ -262,7 +286,9 @@ class CRMTool:
                 "note": appointment_data.note,
                 "deal_id": appointment_data.deal_id,
             }
-            result = self.client._request("POST", "activities", json=payload)
+            result = await asyncio.to_thread(
+                self.client._request, "POST", "activities", json=payload
+            )
             activity = result.get("data", {}) if isinstance(result, dict) else {}
             appointment_id = str(activity.get("id")) if activity.get("id") else None
 
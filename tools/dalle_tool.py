@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import io
@@ -171,14 +172,18 @@ class DALLETool:
         # Build detailed prompt with fabric descriptions and design details
         prompt = self._build_mood_board_prompt(fabrics[:2], occasion, style_keywords, design_preferences)
 
-        # Generate mood board with DALL-E
-        dalle_response = await self.generate_image(
-            DALLEImageRequest(
-                prompt=prompt,
-                size="1024x1024",
-                quality="standard",
+        # Generate mood board with DALL-E; the fabric photos do not depend on
+        # the result, so they are fetched while the image is generated
+        dalle_response, fabric_images = await asyncio.gather(
+            self.generate_image(
+                DALLEImageRequest(
+                    prompt=prompt,
+                    size="1024x1024",
+                    quality="standard",
+                ),
+                decision=decision,
             ),
-            decision=decision,
+            self._fetch_fabric_images(fabrics[:2]),
         )
 
         if not dalle_response.success or not dalle_response.image_url:
@@ -190,7 +195,9 @@ class DALLETool:
 
         # Download DALL-E image
         try:
-            mood_board_img = self._download_image(dalle_response.image_url)
+            mood_board_img = await asyncio.to_thread(
+                self._download_image, dalle_response.image_url
+            )
         except Exception as e:
             logger.error(f"[DALLETool] Failed to download DALL-E image: {e}")
             return dalle_response  # Return original without composite
@@ -198,7 +205,7 @@ class DALLETool:
         # Create composite with fabric thumbnails
         try:
             composite_img = self._create_composite_with_fabric_thumbnails(
-                mood_board_img, fabrics[:2]
+                mood_board_img, fabrics[:2], fabric_images=fabric_images
             )
 
             # Save composite image
@@ -722,10 +729,35 @@ STYLE KEYWORDS: {style_keywords}
         response.raise_for_status()
         return Image.open(io.BytesIO(response.content))
 
+    def _load_fabric_image(self, fabric: Dict[str, Any]) -> Optional[Image.Image]:
+        """Load the first image of a fabric, or None if it has none or fails."""
+        image_urls = fabric.get("image_urls", [])
+        if not image_urls or not image_urls[0]:
+            return None
+
+        try:
+            return self._download_image(image_urls[0])
+        except Exception as e:
+            logger.warning(f"[DALLETool] Failed to download fabric image: {e}")
+            return None
+
+    async def _fetch_fabric_images(
+        self, fabrics: List[Dict[str, Any]]
+    ) -> List[Optional[Image.Image]]:
+        """Load fabric images concurrently in worker threads (blocking I/O)."""
+        if Image is None:
+            return []
+        return list(
+            await asyncio.gather(
+                *(asyncio.to_thread(self._load_fabric_image, fabric) for fabric in fabrics)
+            )
+        )
+
     def _create_composite_with_fabric_thumbnails(
         self,
         mood_board: Image.Image,
         fabrics: List[Dict[str, Any]],
+        fabric_images: Optional[List[Optional[Image.Image]]] = None,
     ) -> Image.Image:
         """
         Create composite image: mood board + fabric thumbnails.
@@ -733,6 +765,8 @@ STYLE KEYWORDS: {style_keywords}
         Args:
             mood_board: DALL-E generated mood board
             fabrics: Fabric data with image URLs (max 2)
+            fabric_images: Already loaded fabric images, one per fabric
+                (loaded here when omitted)
 
         Returns:
             Composite PIL Image
@@ -748,14 +782,15 @@ STYLE KEYWORDS: {style_keywords}
         thumb_width = thumb_height  # Square thumbnails
 
         # Download and resize fabric images
+        if fabric_images is None:
+            fabric_images = [self._load_fabric_image(fabric) for fabric in fabrics[:2]]
+
         fabric_thumbnails = []
-        for fabric in fabrics[:2]:
-            image_urls = fabric.get("image_urls", [])
-            if not image_urls or not image_urls[0]:
+        for fabric, fabric_img in zip(fabrics[:2], fabric_images):
+            if fabric_img is None:
                 continue
 
             try:
-                fabric_img = self._download_image(image_urls[0])
                 # Resize to thumbnail
                 fabric_img.thumbnail((thumb_width, thumb_height), Image.Resampling.LANCZOS)
                 fabric_thumbnails.append({
@@ -764,7 +799,7 @@ STYLE KEYWORDS: {style_keywords}
                     "name": fabric.get("name", ""),
                 })
             except Exception as e:
-                logger.warning(f"[DALLETool] Failed to download fabric image: {e}")
+                logger.warning(f"[DALLETool] Failed to resize fabric image: {e}")
                 continue
 
         if not fabric_thumbnails:
@@ -15,6 +15,11 @@ from models.fabric import FabricRecommendation, FabricSearchCriteria, FabricData
 from models.tools import RAGQuery, RAGResult
 from tools.embedding_service import get_embedding_service
 
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - environment without orjson
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -93,7 +98,8 @@ def _load_fabric_catalog() -> dict[str, dict]:
         logger.warning("[RAGTool] Fabric catalog not found, returning empty index")
         return {}
 
-    catalog_raw = json.loads(_FABRIC_CATALOG_PATH.read_text())
+    raw = _FABRIC_CATALOG_PATH.read_bytes()
+    catalog_raw = orjson.loads(raw) if orjson is not None else json.loads(raw)
     fabrics = catalog_raw.get("fabrics", [])
 
     catalog_index: dict[str, dict] = {}
@@ -2,15 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import json
 import logging
+import os
 import re
 from datetime import date, timedelta
-from typing import Any, Callable, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
 
 from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
 
+from agents.base import LRUCache, keyword_re
 from agents.design_henk import DesignHenkAgent
 from agents.henk1 import Henk1Agent
 from agents.laserhenk import LaserHenkAgent
@@ -24,16 +29,26 @@ from models.handoff import (
     LaserHenkToHITLPayload,
 )
 from models.api_payload import ImagePolicyDecision
-from models.tools import DALLEImageRequest
+from models.tools import CRMLeadCreate, CRMLeadResponse, DALLEImageRequest
 from tools.dalle_tool import DALLETool
 from tools.fabric_preferences import build_fabric_search_criteria
 from tools.rag_tool import RAGTool
 from workflow.graph_state import HenkGraphState
 
+if TYPE_CHECKING:
+    from models.fabric import SelectedFabricData
+
 
 class HandoffAction(BaseModel):
-    kind: str = Field(description="agent | tool | end | clarification")
-    name: str = Field(description="Agent- oder Tool-Name")
+    """
+    Next step of the workflow.
+
+    kind: agent | tool | end | clarification
+    name: Agent- oder Tool-Name
+    """
+
+    kind: str
+    name: str
     params: dict = Field(default_factory=dict)
     user_message: Optional[str] = None
     confidence: Optional[float] = None
@@ -278,19 +293,67 @@ async def _dalle_tool(params: dict, state: HenkGraphState) -> ToolResult:
     session_id = params.get("session_id", session_state.session_id)
 
     # Add vest preference from session state to design_prefs
-    if hasattr(session_state, 'wants_vest') and session_state.wants_vest is not None:
+    if session_state.wants_vest is not None:
         design_prefs["wants_vest"] = session_state.wants_vest
-        logging.info(f"[DALLE Tool] Added wants_vest={session_state.wants_vest} to design_prefs")
+
+    # One summary line; the fabric dump is only built when INFO is enabled
+    if logging.getLogger().isEnabledFor(logging.INFO):
+        logging.info(
+            "[DALLE Tool] fabric_data=%s design_prefs=%s",
+            fabric_data.model_dump(exclude_none=True),
+            design_prefs,
+        )
+
+    # Serve a matching speculative render, otherwise generate now. An explicit
+    # regenerate request always renders a new image.
+    prefetch_key = None
+    if prompt_type == "outfit_visualization" and "request" not in params:
+        prefetch_key = _mood_image_key(session_id, fabric_data, design_prefs, style_keywords)
+    lookup_key = None if params.get("regenerate") else prefetch_key
+    response = _MOOD_IMAGE_CACHE.get(lookup_key) if lookup_key is not None else None
+    if response is not None:
+        logging.info("[DALLE Tool] Serving cached mood board (unchanged inputs)")
     else:
-        logging.info(f"[DALLE Tool] wants_vest not set: hasattr={hasattr(session_state, 'wants_vest')}, value={getattr(session_state, 'wants_vest', None)}")
+        response = await _take_mood_prefetch(lookup_key)
+        if response is None:
+            response = await _render_mood_image(
+                params, fabric_data, design_prefs, style_keywords, prompt_type, session_id, image_policy
+            )
+        else:
+            logging.info("[DALLE Tool] Serving prefetched mood board variant")
+    _cancel_mood_prefetches(session_id)
 
-    # Log for debugging
-    logging.info(f"[DALLE Tool] Using fabric_data: {fabric_data.model_dump(exclude_none=True)}")
-    logging.info(f"[DALLE Tool] Final design_prefs: {design_prefs}")
+    # Store generated image in session state
+    image_url = getattr(response, "image_url", None)
+    if image_url:
+        session_state.mood_image_url = image_url
+        session_state.image_generation_history.append({"image_url": image_url, "type": "dalle_composite" if fabric_data.image_url else "dalle"})
+        state["session_state"] = session_state
 
+    if image_url and prefetch_key is not None:
+        _MOOD_IMAGE_CACHE.put(prefetch_key, response)
+        _schedule_mood_prefetch(
+            params, fabric_data, design_prefs, style_keywords, prompt_type, session_id, image_policy
+        )
+
+    text = response.error if getattr(response, "error", None) else "Hier ist dein illustratives Mood Board. Die echten Stoffbilder findest du separat."
+    metadata = {"image_url": image_url} if image_url else {}
+    return ToolResult(text=text, metadata=metadata)
+
+
+async def _render_mood_image(
+    params: dict,
+    fabric_data: "SelectedFabricData",
+    design_prefs: dict,
+    style_keywords: list[str],
+    prompt_type: str,
+    session_id: str,
+    image_policy: Optional[ImagePolicyDecision],
+) -> Any:
+    """Generate the mood board image for ``_dalle_tool`` (composite or text-only)."""
     # OPTION 1: Use fabric image for composite (if available)
     if fabric_data.image_url and prompt_type == "outfit_visualization":
-        logging.info(f"[DALLE Tool] Using composite generation with fabric image: {fabric_data.image_url}")
+        logging.info("[DALLE Tool] Using composite generation with fabric image: %s", fabric_data.image_url)
 
         # Convert SelectedFabricData to fabric dict format expected by generate_mood_board_with_fabrics
         fabric_dict = {
@@ -334,23 +397,125 @@ async def _dalle_tool(params: dict, state: HenkGraphState) -> ToolResult:
         else:
             prompt = params.get("prompt") or "Mood Board für ein elegantes Outfit"
 
-        logging.info(f"[DALLE Tool] Generated prompt preview: {prompt[:200]}...")
+        logging.info("[DALLE Tool] Generated prompt preview: %.200s...", prompt)
 
         request = params.get("request")
         request = request if isinstance(request, DALLEImageRequest) else DALLEImageRequest(prompt=prompt)
 
         response = await DALLETool().generate_image(request=request, decision=image_policy)
 
-    # Store generated image in session state
-    image_url = getattr(response, "image_url", None)
-    if image_url:
-        session_state.mood_image_url = image_url
-        session_state.image_generation_history.append({"image_url": image_url, "type": "dalle_composite" if fabric_data.image_url else "dalle"})
-        state["session_state"] = session_state
+    return response
 
-    text = response.error if getattr(response, "error", None) else "Hier ist dein illustratives Mood Board. Die echten Stoffbilder findest du separat."
-    metadata = {"image_url": image_url} if image_url else {}
-    return ToolResult(text=text, metadata=metadata)
+
+# Speculative mood-board prefetch (opt-in via ENABLE_MOOD_PREFETCH, costs
+# MOOD_PREFETCH_VARIANTS extra images per iteration, default 1): while the user
+# looks at a mood board, render the most likely next variants concurrently. If
+# the next dalle_tool call asks for one of them, the prefetched (or still
+# running) render is used instead. Finished renders move into
+# _MOOD_IMAGE_CACHE, so only in-flight tasks are kept here.
+_MOOD_PREFETCH: Dict[str, "asyncio.Task[Any]"] = {}
+
+# Finished mood boards by _mood_image_key: feedback that leaves fabric, design
+# preferences and style keywords unchanged gets the previous image back
+# instead of a new DALL-E call.
+_MOOD_IMAGE_CACHE = LRUCache(256)
+
+# Most common shoulder feedback: one step softer/stronger, most likely first
+_SHOULDER_VARIANTS = {
+    "none": ("light",),
+    "light": ("medium", "none"),
+    "medium": ("light", "structured"),
+    "structured": ("medium",),
+}
+
+
+def _mood_prefetch_enabled() -> bool:
+    return os.getenv("ENABLE_MOOD_PREFETCH", "false").lower() == "true"
+
+
+def _mood_prefetch_variants() -> int:
+    """Number of candidate variants rendered concurrently per iteration (MOOD_PREFETCH_VARIANTS)."""
+    try:
+        return max(int(os.getenv("MOOD_PREFETCH_VARIANTS", "1")), 0)
+    except ValueError:
+        return 1
+
+
+def _mood_image_key(
+    session_id: str, fabric_data: "SelectedFabricData", design_prefs: dict, style_keywords: list[str]
+) -> str:
+    return json.dumps(
+        [session_id, fabric_data.model_dump(exclude_none=True), design_prefs, style_keywords],
+        sort_keys=True,
+        default=str,
+    )
+
+
+def _predict_next_design_prefs(design_prefs: dict) -> list[dict]:
+    """Guess the design preferences of the next mood-board iteration, most likely first."""
+    return [
+        {**design_prefs, "shoulder_padding": shoulder}
+        for shoulder in _SHOULDER_VARIANTS.get(design_prefs.get("shoulder_padding"), ())
+    ]
+
+
+def _finish_mood_prefetch(key: str, task: "asyncio.Task[Any]") -> None:
+    """Done-callback: unregister the task and keep a successful render in the bounded cache."""
+    if _MOOD_PREFETCH.get(key) is task:
+        del _MOOD_PREFETCH[key]
+    if task.cancelled() or task.exception() is not None:
+        return
+    response = task.result()
+    if getattr(response, "image_url", None):
+        _MOOD_IMAGE_CACHE.put(key, response)
+
+
+async def _take_mood_prefetch(key: Optional[str]) -> Any:
+    """Return the prefetched render for ``key`` if it produced an image."""
+    task = _MOOD_PREFETCH.pop(key, None) if key is not None else None
+    if task is None:
+        return None
+    try:
+        response = await task
+    except Exception:  # pragma: no cover - prefetch failures fall back to a live render
+        return None
+    return response if getattr(response, "image_url", None) else None
+
+
+def _cancel_mood_prefetches(session_id: str) -> None:
+    """Drop speculative renders of a session that were not used."""
+    prefix = json.dumps([session_id])[:-1]
+    for key in [key for key in _MOOD_PREFETCH if key.startswith(prefix)]:
+        _MOOD_PREFETCH.pop(key).cancel()
+
+
+def _schedule_mood_prefetch(
+    params: dict,
+    fabric_data: "SelectedFabricData",
+    design_prefs: dict,
+    style_keywords: list[str],
+    prompt_type: str,
+    session_id: str,
+    image_policy: Optional[ImagePolicyDecision],
+) -> None:
+    if not _mood_prefetch_enabled():
+        return
+    # Candidates render concurrently; whichever the feedback asks for is served
+    for next_prefs in _predict_next_design_prefs(design_prefs)[: _mood_prefetch_variants()]:
+        key = _mood_image_key(session_id, fabric_data, next_prefs, style_keywords)
+        if key in _MOOD_IMAGE_CACHE:
+            continue
+        task = asyncio.create_task(
+            _render_mood_image(
+                params, fabric_data, next_prefs, style_keywords, prompt_type, session_id, image_policy
+            )
+        )
+        task.add_done_callback(functools.partial(_finish_mood_prefetch, key))
+        _MOOD_PREFETCH[key] = task
+        logging.info(
+            "[DALLE Tool] Prefetching mood board variant: shoulder_padding=%s",
+            next_prefs["shoulder_padding"],
+        )
 
 
 def _build_outfit_prompt(fabric_data: "SelectedFabricData", design_prefs: dict, style_keywords: list[str]) -> str:
@@ -459,10 +624,7 @@ async def _mark_favorite_fabric(params: dict, state: HenkGraphState) -> ToolResu
     if not fabric_code:
         return ToolResult(text="Welchen Stoff möchtest du als Favoriten markieren?")
 
-    fabric = next(
-        (item for item in getattr(session_state, "shown_fabric_images", []) if item.get("fabric_code") == fabric_code),
-        None,
-    )
+    fabric = session_state.fabric_state.find_shown_fabric(fabric_code)
 
     if not fabric:
         return ToolResult(text="Ich habe diesen Stoff leider nicht gefunden.")
@@ -524,9 +686,6 @@ async def _show_fabric_images(params: dict, state: HenkGraphState) -> ToolResult
 
 async def _crm_create_lead(params: dict, state: HenkGraphState) -> ToolResult:
     """Create CRM lead in Pipedrive."""
-    from tools.crm_tool import CRMTool
-    from models.tools import CRMLeadCreate
-
     session_state = _session_state(state)
 
     # Extract customer data
@@ -540,8 +699,7 @@ async def _crm_create_lead(params: dict, state: HenkGraphState) -> ToolResult:
         logging.error(f"[CRM] Lead creation failed: No email provided for {customer_name}")
 
         # Create MOCK lead to prevent infinite loop
-        session_id = params.get("session_id", "unknown")
-        mock_lead_id = f"NO_EMAIL_{session_id[:8]}"
+        mock_lead_id = f"NO_EMAIL_{session_state.session_id[:8]}"
         session_state.customer.crm_lead_id = mock_lead_id
         state["session_state"] = session_state
 
@@ -565,12 +723,10 @@ async def _crm_create_lead(params: dict, state: HenkGraphState) -> ToolResult:
         deal_value=2000.0,  # Default suit value, can be adjusted
     )
 
-    # Create lead
-    crm_tool = CRMTool()
-    response = await crm_tool.create_lead(lead_data)
+    mood_image_url = params.get("mood_image_url") if params.get("archive_mood_image") else None
+    response = await _create_lead_and_archive(lead_data, session_state.session_id, mood_image_url)
 
     if response.success:
-        # Store CRM lead ID in session state
         session_state.customer.crm_lead_id = response.lead_id
         state["session_state"] = session_state
 
@@ -578,20 +734,45 @@ async def _crm_create_lead(params: dict, state: HenkGraphState) -> ToolResult:
             text=f"✅ Lead erfolgreich im CRM gesichert (ID: {response.lead_id})",
             metadata={"crm_lead_id": response.lead_id, "deal_id": response.deal_id},
         )
-    else:
-        # CRITICAL FIX: Create MOCK lead to prevent infinite loop when Pipedrive is not configured
-        logging.warning(f"[CRM] Lead creation failed: {response.message} - Creating MOCK lead to prevent infinite loop")
-        session_id = params.get("session_id", "unknown")
-        mock_lead_id = f"MOCK_CRM_{session_id[:8]}"
-        session_state.customer.crm_lead_id = mock_lead_id
-        state["session_state"] = session_state
 
-        return ToolResult(
-            text=f"✅ Lead gesichert (Dev-Modus: {mock_lead_id})\n\n"
-                 f"💡 Hinweis: Pipedrive CRM ist nicht konfiguriert. "
-                 f"Bitte PIPEDRIVE_API_KEY in .env setzen für echte Lead-Erstellung.",
-            metadata={"crm_lead_id": mock_lead_id, "mock": True, "error": response.message},
-        )
+    # CRITICAL FIX: Create MOCK lead to prevent infinite loop when Pipedrive is not configured
+    logging.warning(
+        "[CRM] Lead creation failed: %s - Creating MOCK lead to prevent infinite loop",
+        response.message,
+    )
+    mock_lead_id = f"MOCK_CRM_{session_state.session_id[:8]}"
+    session_state.customer.crm_lead_id = mock_lead_id
+    state["session_state"] = session_state
+
+    return ToolResult(
+        text=f"✅ Lead gesichert (Dev-Modus: {mock_lead_id})\n\n"
+             f"💡 Hinweis: Pipedrive CRM ist nicht konfiguriert. "
+             f"Bitte PIPEDRIVE_API_KEY in .env setzen für echte Lead-Erstellung.",
+        metadata={"crm_lead_id": mock_lead_id, "mock": True, "error": response.message},
+    )
+
+
+async def _create_lead_and_archive(
+    lead_data: CRMLeadCreate, session_id: str, mood_image_url: Optional[str]
+) -> CRMLeadResponse:
+    """Create the Pipedrive lead; archive the approved mood image alongside (independent I/O)."""
+    from tools.crm_tool import CRMTool
+
+    crm_tool = CRMTool()
+    if not mood_image_url:
+        return await crm_tool.create_lead(lead_data)
+
+    from tools.image_storage import get_storage_manager
+
+    response, archived_path = await asyncio.gather(
+        crm_tool.create_lead(lead_data),
+        get_storage_manager().archive_to_session_docs(
+            session_id=session_id,
+            image_url=mood_image_url,
+        ),
+    )
+    logging.info("[CRM] Approved mood image archived: %s", archived_path)
+    return response
 
 
 async def _crm_create_appointment(params: dict, state: HenkGraphState) -> ToolResult:
@@ -659,6 +840,26 @@ async def validate_node(state: HenkGraphState) -> HenkGraphState:
     return {"is_valid": True, "awaiting_user_input": False}
 
 
+# RouteNode keyword tables, matched as substrings of the lowercased message
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_FABRIC_FEEDBACK_RE = keyword_re([
+    "zu hell", "zu dunkel", "heller", "dunkler", "andere farbe",
+    "anderes muster", "einfarbig", "gemustert", "uni", "kariert",
+    "gestreift", "anders", "nicht passend", "andere stoffe",
+])
+_MOOD_APPROVAL_RE = keyword_re([
+    "ja", "yes", "genehmigt", "approved", "perfekt", "perfect",
+    "super", "toll", "gefällt mir", "passt", "ok", "okay",
+    "bestätigt", "confirmed", "genau so", "stimmt",
+])
+_MOOD_FEEDBACK_RE = keyword_re([
+    "nein", "no", "nicht", "anders", "ändern", "anpassen",
+    "change", "modify", "andere", "lieber", "stattdessen",
+])
+_LOCATION_HOME_RE = keyword_re(["zu hause", "zuhause", "daheim", "bei mir", "home", "bei mir zu hause"])
+_LOCATION_OFFICE_RE = keyword_re(["büro", "office", "arbeit", "firma", "im büro", "ins büro"])
+
+
 async def route_node(state: HenkGraphState) -> HenkGraphState:
     session_state = _session_state(state)
     session_state.conversation_history = [_serialize_message(m) for m in state.get("messages", [])]
@@ -669,14 +870,12 @@ async def route_node(state: HenkGraphState) -> HenkGraphState:
     user_message = _latest_content(state.get("messages", []), "user") or state.get("user_input", "")
 
     # EMAIL DETECTION (highest priority - needed for CRM lead creation)
-    import re
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    email_match = re.search(email_pattern, user_message)
+    email_match = _EMAIL_RE.search(user_message)
     if email_match and not session_state.customer.email:
         email = email_match.group(0)
         session_state.customer.email = email
         state["session_state"] = session_state
-        logger.info(f"[RouteNode] Email detected and stored: {email}")
+        logger.info("[RouteNode] Email detected and stored: %s", email)
 
         # If we're in design_henk waiting for email, route back to design_henk
         if session_state.current_agent == "design_henk":
@@ -698,14 +897,8 @@ async def route_node(state: HenkGraphState) -> HenkGraphState:
         user_message_lower = user_message.lower().strip()
 
         # Check for fabric feedback keywords (color/pattern changes)
-        fabric_feedback_keywords = [
-            "zu hell", "zu dunkel", "heller", "dunkler", "andere farbe",
-            "anderes muster", "einfarbig", "gemustert", "uni", "kariert",
-            "gestreift", "anders", "nicht passend", "andere stoffe",
-        ]
-
-        if any(keyword in user_message_lower for keyword in fabric_feedback_keywords):
-            logger.info(f"[RouteNode] Fabric feedback detected: {user_message}")
+        if _FABRIC_FEEDBACK_RE.search(user_message_lower):
+            logger.info("[RouteNode] Fabric feedback detected: %s", user_message)
             # Reset fabric shown flag to allow new RAG search
             session_state.henk1_fabrics_shown = False
             state["session_state"] = session_state
@@ -734,13 +927,7 @@ async def route_node(state: HenkGraphState) -> HenkGraphState:
         user_message_lower = user_message.lower().strip()
 
         # Check for approval keywords
-        approval_keywords = [
-            "ja", "yes", "genehmigt", "approved", "perfekt", "perfect",
-            "super", "toll", "gefällt mir", "passt", "ok", "okay",
-            "bestätigt", "confirmed", "genau so", "stimmt",
-        ]
-
-        if any(keyword in user_message_lower for keyword in approval_keywords):
+        if _MOOD_APPROVAL_RE.search(user_message_lower):
             # User approved the mood board
             logger.info("[RouteNode] Mood board approved by user")
             session_state.image_state.mood_board_approved = True
@@ -755,14 +942,9 @@ async def route_node(state: HenkGraphState) -> HenkGraphState:
             }
 
         # Check for rejection/feedback keywords
-        feedback_keywords = [
-            "nein", "no", "nicht", "anders", "ändern", "anpassen",
-            "change", "modify", "andere", "lieber", "stattdessen",
-        ]
-
-        if any(keyword in user_message_lower for keyword in feedback_keywords) or len(user_message) > 20:
+        if _MOOD_FEEDBACK_RE.search(user_message_lower) or len(user_message) > 20:
             # User wants changes - store feedback
-            logger.info(f"[RouteNode] Mood board feedback from user: {user_message}")
+            logger.info("[RouteNode] Mood board feedback from user: %s", user_message)
             session_state.image_state.mood_board_feedback = user_message
             state["session_state"] = session_state
 
@@ -775,18 +957,15 @@ async def route_node(state: HenkGraphState) -> HenkGraphState:
             }
 
     # APPOINTMENT LOCATION + DATE/TIME DETECTION
-    if (
-        session_state.customer.crm_lead_id
-        and not session_state.customer.crm_lead_id.startswith("HENK1_LEAD")
-    ):
+    if session_state.customer.has_crm_lead:
         prefs = session_state.customer.appointment_preferences or {}
         user_message_lower = user_message.lower().strip()
 
         location = prefs.get("location")
         if not location:
-            if any(word in user_message_lower for word in ["zu hause", "zuhause", "daheim", "bei mir", "home", "bei mir zu hause"]):
+            if _LOCATION_HOME_RE.search(user_message_lower):
                 location = "Kunde zu Hause"
-            elif any(word in user_message_lower for word in ["büro", "office", "arbeit", "firma", "im büro", "ins büro"]):
+            elif _LOCATION_OFFICE_RE.search(user_message_lower):
                 location = "Im Büro"
 
         due_date = prefs.get("due_date") or _parse_appointment_date(user_message)